@@ -1,12 +1,19 @@
 # app.py
+import functools
+import hashlib
 import os
+import re
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 from espn_lookup import find_game_id
 from kalshi_service import KalshiService
@@ -22,348 +29,337 @@ st.set_page_config(page_title="OddSense",
 
 CONTEXT_URL = os.getenv("CONTEXT_URL", "http://localhost:8000")
 
-# Figma-like Dark Mode CSS
-st.markdown("""
-<style>
-    /* Global dark theme */
-    .stApp {
-        background-color: #0f172a;
-    }
-
-    /* Top Navigation Menu */
-    .top-nav {
-        background: #1e293b;
-        border-bottom: 1px solid #334155;
-        padding: 0.75rem 1rem;
-        margin-bottom: 1.5rem;
-        border-radius: 8px;
-        display: flex;
-        align-items: center;
-        justify-content: space-between;
-        gap: 1rem;
-        flex-wrap: wrap;
-    }
-
-    .nav-brand {
-        font-size: 1.5rem;
-        font-weight: 700;
-        color: #f1f5f9;
-        text-decoration: none;
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-    }
-
-    .nav-links {
-        display: flex;
-        gap: 0.5rem;
-        flex-wrap: wrap;
-    }
-
-    .nav-link {
-        background: transparent;
-        border: 1px solid #334155;
-        color: #94a3b8;
-        padding: 0.5rem 1rem;
-        border-radius: 6px;
-        text-decoration: none;
-        font-weight: 500;
-        transition: all 0.2s ease;
-    }
-
-    .nav-link:hover {
-        background: #334155;
-        color: #f1f5f9;
-        border-color: #475569;
-    }
-
-    .nav-link.active {
-        background: #6366f1;
-        color: white;
-        border-color: #6366f1;
-    }
-
-    @media (max-width: 768px) {
-        .top-nav {
-            flex-direction: column;
-            align-items: flex-start;
-        }
-
-        .nav-links {
-            width: 100%;
-        }
-
-        .nav-link {
-            flex: 1;
-            text-align: center;
-        }
-    }
-
-    /* Mobile-first responsive design */
-    @media (max-width: 768px) {
-        .stApp {
-            padding: 0.5rem;
-        }
-        h1 {
-            font-size: 1.75rem !important;
-        }
-        h2 {
-            font-size: 1.25rem !important;
-        }
-    }
-
-    /* Typography improvements */
-    h1 {
-        font-weight: 700 !important;
-        letter-spacing: -0.02em !important;
-        color: #f1f5f9 !important;
-    }
-
-    /* Odds quality indicators - dark mode */
-    .odds-excellent {
-        background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-        color: white;
-        padding: 0.75rem 1rem;
-        border-radius: 10px;
-        font-weight: 700;
-        box-shadow: 0 4px 12px rgba(16, 185, 129, 0.4);
-    }
-
-    .odds-good {
-        background: linear-gradient(135deg, #6366f1 0%, #4f46e5 100%);
-        color: white;
-        padding: 0.75rem 1rem;
-        border-radius: 10px;
-        font-weight: 700;
-        box-shadow: 0 4px 12px rgba(99, 102, 241, 0.4);
-    }
-
-    .odds-neutral {
-        background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%);
-        color: white;
-        padding: 0.75rem 1rem;
-        border-radius: 10px;
-        font-weight: 700;
-        box-shadow: 0 4px 12px rgba(245, 158, 11, 0.4);
-    }
-
-    .odds-poor {
-        background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
-        color: white;
-        padding: 0.75rem 1rem;
-        border-radius: 10px;
-        font-weight: 700;
-        box-shadow: 0 4px 12px rgba(239, 68, 68, 0.4);
-    }
-
-    /* Figma-like dark market cards */
-    .market-card {
-        background: #1e293b;
-        border-radius: 12px;
-        padding: 1.25rem;
-        margin-bottom: 1rem;
-        border: 1px solid #334155;
-        box-shadow: 0 4px 16px rgba(0, 0, 0, 0.3);
-        transition: all 0.2s ease;
-    }
-
-    .market-card:hover {
-        border-color: #475569;
-        box-shadow: 0 8px 24px rgba(0, 0, 0, 0.4);
-        transform: translateY(-2px);
-    }
-
-    .market-card-excellent {
-        border-left: 3px solid #10b981;
-    }
-
-    .market-card-good {
-        border-left: 3px solid #6366f1;
-    }
-
-    .market-card-neutral {
-        border-left: 3px solid #f59e0b;
-    }
-
-    .market-card-poor {
-        border-left: 3px solid #ef4444;
-    }
-
-    /* Probability badge - dark mode */
-    .prob-badge {
-        display: inline-block;
-        font-size: 1.75rem;
-        font-weight: 800;
-        padding: 0.375rem 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-        letter-spacing: -0.02em;
-    }
-
-    /* Value indicator - dark mode */
-    .value-indicator {
-        font-size: 0.875rem;
-        font-weight: 600;
-        padding: 0.375rem 0.75rem;
-        border-radius: 8px;
-        display: inline-block;
-        margin-top: 0.375rem;
-        letter-spacing: 0.01em;
-    }
-
-    .value-strong {
-        background: rgba(16, 185, 129, 0.15);
-        color: #6ee7b7;
-        border: 1px solid rgba(16, 185, 129, 0.3);
-    }
-
-    .value-moderate {
-        background: rgba(99, 102, 241, 0.15);
-        color: #a5b4fc;
-        border: 1px solid rgba(99, 102, 241, 0.3);
-    }
-
-    .value-weak {
-        background: rgba(239, 68, 68, 0.15);
-        color: #fca5a5;
-        border: 1px solid rgba(239, 68, 68, 0.3);
-    }
-
-    /* Market metrics row - dark mode */
-    .market-metrics {
-        font-size: 0.8rem !important;
-        color: #94a3b8 !important;
-        display: flex;
-        gap: 14px;
-        flex-wrap: wrap;
-        margin-top: 0.75rem;
-        font-weight: 500;
-    }
-
-    .market-metrics span {
-        font-size: 0.8rem !important;
-        color: #94a3b8 !important;
-        background: rgba(51, 65, 85, 0.5);
-        padding: 0.25rem 0.625rem;
-        border-radius: 6px;
-    }
-
-    /* Buttons - dark mode */
-    .stButton > button {
-        background: #1e293b !important;
-        border: 1px solid #334155 !important;
-        color: #f1f5f9 !important;
-        border-radius: 8px !important;
-        font-weight: 600 !important;
-        transition: all 0.2s ease !important;
-    }
-
-    .stButton > button:hover {
-        background: #334155 !important;
-        border-color: #475569 !important;
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3) !important;
-    }
-
-    /* Link buttons - dark mode */
-    a[data-testid="stLinkButton"] {
-        text-decoration: none !important;
-    }
-
-    /* Sidebar - dark mode */
-    [data-testid="stSidebar"] {
-        background-color: #1e293b !important;
-    }
-
-    /* Inputs - dark mode */
-    .stTextInput input {
-        background-color: #1e293b !important;
-        border: 1px solid #334155 !important;
-        color: #f1f5f9 !important;
-        border-radius: 8px !important;
-    }
-
-    .stTextInput input:focus {
-        border-color: #6366f1 !important;
-        box-shadow: 0 0 0 1px #6366f1 !important;
-    }
-
-    /* Number input - dark mode */
-    .stNumberInput input {
-        background-color: #1e293b !important;
-        border: 1px solid #334155 !important;
-        color: #f1f5f9 !important;
-        border-radius: 8px !important;
-    }
-
-    /* Plotly chart containers - dark mode */
-    .js-plotly-plot,
-    .plotly {
-        background-color: #1e293b !important;
-        border-radius: 8px;
-    }
-
-    .stPlotlyChart {
-        background-color: #1e293b !important;
-        border-radius: 8px;
-    }
-</style>
-""",
-            unsafe_allow_html=True)
+# Columns shown in the "All Event Contracts" table
+_CONTRACT_COLUMNS = (
+    "ticker", "title", "subtitle", "yes_bid", "yes_ask", "open_interest",
+    "volume_24h", "close_dt", "market_type"
+)
+
+# Team abbreviations embedded in Kalshi event tickers (e.g. ...ATLIND)
+_TEAM_CODE_RE = re.compile(r'[A-Z]{2,3}')
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets",
+                        "style.css")
+
+
+@st.cache_resource
+def _load_css() -> str:
+    """Read the app stylesheet once per process."""
+    with open(CSS_PATH, encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
 
+# Figma-like Dark Mode CSS
+st.markdown(_load_css(), unsafe_allow_html=True)
 
-# Manual per-sport service caching to avoid Streamlit cache_resource issues
-_SERVICE_CACHE = {
-    "kalshi": {},
-    "odds_api": {},
-    "espn": {}
-}
 
+# Per-sport service clients, shared across reruns and sessions
+@st.cache_resource
 def get_kalshi(sport: str = "nfl") -> KalshiService:
     """Get cached KalshiService for a specific sport."""
-    if sport not in _SERVICE_CACHE["kalshi"]:
-        _SERVICE_CACHE["kalshi"][sport] = KalshiService(sport=sport)
-    return _SERVICE_CACHE["kalshi"][sport]
+    return KalshiService(sport=sport)
+
 
+@st.cache_resource
 def get_odds_api(sport: str = "nfl") -> OddsAPIService:
     """Get cached OddsAPIService for a specific sport."""
-    if sport not in _SERVICE_CACHE["odds_api"]:
-        _SERVICE_CACHE["odds_api"][sport] = OddsAPIService(sport=sport)
-    return _SERVICE_CACHE["odds_api"][sport]
+    return OddsAPIService(sport=sport)
 
+
+@st.cache_resource
 def get_espn(sport: str = "nfl") -> ESPNService:
     """Get cached ESPNService for a specific sport."""
-    if sport not in _SERVICE_CACHE["espn"]:
-        _SERVICE_CACHE["espn"][sport] = ESPNService(sport=sport)
-    return _SERVICE_CACHE["espn"][sport]
+    return ESPNService(sport=sport)
 
 
-def qp_get(name: str, default: str = "list") -> str:
+@st.cache_resource
+def get_prediction_service() -> PredictionService:
+    """Get the shared PredictionService (creates the tables once)."""
+    return PredictionService()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_events(sport: str = "nfl") -> tuple[list[dict], dict[str, dict]]:
+    """
+    Fetch grouped open events for a sport, cached across reruns.
+
+    Returns (events, events_by_ticker) where events_by_ticker indexes the
+    same event dicts by event_ticker.
+    """
+    events = get_kalshi(sport).fetch_and_group_open_games()
+    for ev in events:
+        # Annotate events with sport metadata
+        ev["_sport"] = sport
+        # Lowercased haystack for the list-page search filter
+        ev["_search_blob"] = " ".join([
+            ev["pretty_event"] or "", ev["home_team"], ev["away_team"],
+            *(f"{c.get('title') or ''} {c.get('subtitle') or ''}"
+              for c in ev["all_contracts"])
+        ]).lower()
+        # Contracts ordered by close time (missing close times last)
+        ev["all_contracts_sorted"] = sorted(
+            ev["all_contracts"],
+            key=lambda c: (c.get("close_dt") is None, c.get("close_dt")))
+    return events, {ev["event_ticker"]: ev for ev in events}
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _search_hits(blobs: tuple[str, ...], q: str) -> list[int]:
+    """
+    Positions of the search blobs matching a lowercased search query.
+
+    Cached per (blobs, query), so paging through results doesn't refilter
+    the events on every rerun, while changed contract text misses the cache.
+    """
+    # Every whitespace-separated token must appear (in any order)
+    pattern = re.compile("".join(f"(?=.*{re.escape(tok)})"
+                                 for tok in q.split()))
+    return np.flatnonzero(pd.Series(blobs).str.contains(pattern)).tolist()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_team_leaders(sport: str, team: str,
+                        category: str) -> list[dict]:
+    """Fetch ESPN stat leaders for a team, cached for five minutes."""
+    return get_espn(sport).get_team_leaders(team, category=category)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_game_result(sport: str, away: str, home: str,
+                       close_dt_iso: str) -> Optional[dict]:
+    """
+    Look up an ESPN game result near the market close time.
+
+    Final scoreboards are also kept for a day by ESPNService's own response
+    cache, so a finished game doesn't go back to ESPN when this expires.
+    """
+    return get_espn(sport).find_game_by_teams_and_date(
+        away_team=away,
+        home_team=home,
+        game_date=pd.Timestamp(close_dt_iso).to_pydatetime())
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_candlesticks(sport: str, ticker: str) -> Optional[list[dict]]:
+    """Fetch hourly candlesticks for a market ticker, cached per ticker."""
+    kalshi = get_kalshi(sport)
+    return kalshi.get_market_candlesticks(
+        series_ticker=kalshi.series_ticker,
+        ticker=ticker,
+        period_interval=60  # 1-hour candles
+    )
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_price_series(
+    sport: str, ticker: str
+) -> Optional[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Chart-ready (timestamps, closes, volumes) arrays for a market ticker.
+
+    Candles without a close price are dropped in the same single pass that
+    fills the arrays. Returns None when no candlestick data is available.
+    """
+    candlesticks = _fetch_candlesticks(sport, ticker)
+    if not candlesticks:
+        return None
+    series = np.fromiter(
+        ((c["timestamp"], c["close"], c.get("volume") or 0)
+         for c in candlesticks if c.get("close") is not None),
+        dtype=[("t", "O"), ("c", "f8"), ("v", "f8")])
+    return series["t"], series["c"], series["v"]
+
+
+def _price_series_key(timestamps: np.ndarray, closes: np.ndarray,
+                      volumes: np.ndarray) -> str:
+    """Digest of a whole price series, so revised past candles count too."""
+    h = hashlib.blake2b(digest_size=16)
+    # Object-dtype timestamps have no stable buffer; hash their text instead
+    h.update("\0".join(map(str, timestamps)).encode())
+    h.update(closes.tobytes())
+    h.update(volumes.tobytes())
+    return h.hexdigest()
+
+
+# Dark-theme layouts for the price and volume charts
+_PRICE_LAYOUT = dict(title="Price Over Time (Hourly)",
+                     xaxis_title="Time",
+                     yaxis_title="Price (Probability)",
+                     yaxis=dict(tickformat='.0%', range=[0, 1]),
+                     hovermode='x unified',
+                     height=400,
+                     template='plotly_dark',
+                     paper_bgcolor='#1e293b',
+                     plot_bgcolor='#1e293b',
+                     font=dict(color='#f1f5f9'))
+_VOLUME_LAYOUT = dict(title="Trading Volume Over Time",
+                      xaxis_title="Time",
+                      yaxis_title="Volume",
+                      height=300,
+                      template='plotly_dark',
+                      paper_bgcolor='#1e293b',
+                      plot_bgcolor='#1e293b',
+                      font=dict(color='#f1f5f9'))
+
+
+@st.cache_data(ttl=60, max_entries=64, show_spinner=False)
+def _build_price_figures(
+    sport: str, ticker: str, series_key: str,
+    _timestamps: np.ndarray, _closes: np.ndarray, _volumes: np.ndarray
+) -> tuple["go.Figure", Optional["go.Figure"]]:
+    """
+    Build the (price, volume) Plotly figures for a ticker's price series.
+
+    The arrays are left out of the key since the object-dtype timestamps
+    hash by identity; series_key (see _price_series_key) stands in for
+    them, so a refreshed series always gets fresh figures. The volume
+    figure is None when nothing has traded.
+    """
+    # Imported here so pages without a chart never load plotly
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+
+    # WebGL line trace, so long histories don't become one SVG node per point
+    fig.add_trace(
+        go.Scattergl(
+            x=_timestamps,
+            y=_closes,
+            mode='lines',
+            name='Close Price',
+            line=dict(color='#6366f1', width=3),
+            hovertemplate=
+            '<b>Time:</b> %{x}<br><b>Price:</b> $%{y:.2f}<extra></extra>'
+        ))
+
+    fig.update_layout(**_PRICE_LAYOUT)
+
+    if not _volumes.max() > 0:
+        return fig, None
+
+    fig_vol = go.Figure()
+    fig_vol.add_trace(
+        go.Bar(
+            x=_timestamps,
+            y=_volumes,
+            name='Volume',
+            marker_color='#10b981',
+            hovertemplate=
+            '<b>Time:</b> %{x}<br><b>Volume:</b> %{y}<extra></extra>'
+        ))
+
+    fig_vol.update_layout(**_VOLUME_LAYOUT)
+    return fig, fig_vol
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _fetch_orderbook(sport: str, ticker: str) -> Optional[dict]:
+    """Fetch the current order book for a market ticker, cached briefly."""
+    return get_kalshi(sport).get_market_orderbook(ticker)
+
+
+# Streamlit >= 1.30 exposes st.query_params; older versions only have the
+# experimental getters/setters. Decide once instead of per call.
+_HAS_QUERY_PARAMS = hasattr(st, "query_params")
+
+
+def _thread_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Thread pool whose workers share the current Streamlit script context."""
+    return ThreadPoolExecutor(max_workers=max_workers,
+                              initializer=add_script_run_ctx,
+                              initargs=(None, get_script_run_ctx()))
+
+
+def _collect(future: Future, default, warning: str):
+    """A background fetch's result, or default after a warning if it raised."""
     try:
+        return future.result()
+    except Exception as e:
+        st.warning(f"{warning}: {e}")
+        return default
+
+
+def qp_get(name: str, default: str = "list") -> str:
+    if _HAS_QUERY_PARAMS:
         return st.query_params.get(name, default)
-    except Exception:
-        return st.experimental_get_query_params().get(name, [default])[0]
+    return st.experimental_get_query_params().get(name, [default])[0]
 
 
 def qp_set(**kwargs):
-    try:
+    if _HAS_QUERY_PARAMS:
         st.query_params.update(kwargs)
-    except Exception:
+    else:
         st.experimental_set_query_params(**kwargs)
 
 
+def _qp_int(name: str, default: int, lo: int, hi: int) -> int:
+    """Integer query param clamped to [lo, hi], or default if malformed."""
+    try:
+        return max(lo, min(int(qp_get(name, str(default))), hi))
+    except ValueError:
+        return default
+
+
 def init_state():
-    st.session_state.setdefault("search", "")
-    st.session_state.setdefault("events_per_page", 12)
-    st.session_state.setdefault("p", 1)
+    # List state is mirrored into the URL, so deep links restore it
+    st.session_state.setdefault("search", qp_get("q", ""))
+    st.session_state.setdefault("events_per_page",
+                                _qp_int("per", 12, 6, 50))
+    st.session_state.setdefault("p", _qp_int("p", 1, 1, 10_000))
     
     # Initialize user session for predictions
     if "user_session_id" not in st.session_state:
-        prediction_service = PredictionService()
-        st.session_state.user_session_id = prediction_service.generate_session_id()
+        st.session_state.user_session_id = get_prediction_service().generate_session_id()
+
+
+# Preformatted whole percentages, indexed by round(prob * 100)
+_PCT_STR = tuple(f"{i}%" for i in range(101))
+_PCT_ARR = np.array(_PCT_STR)
 
 
 def pct(x: Optional[float]) -> str:
-    return f"{x*100:.0f}%" if isinstance(x, (int, float)) else "—"
+    if not isinstance(x, (int, float)):
+        return "—"
+    if 0 <= x <= 1:
+        return _PCT_STR[round(x * 100)]
+    return f"{x*100:.0f}%"
+
+
+def _canon(text: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace for name matching."""
+    return _WHITESPACE_RE.sub(' ', _NON_WORD_RE.sub('', text.lower())).strip()
+
+
+def format_time_left(
+        close_dt: Optional[datetime],
+        now: datetime) -> tuple[str, str, Optional[float]]:
+    """
+    Describe the time until a market closes.
+
+    Returns (short, long, hours_left): a compact badge such as "5d", "7h"
+    or "Closed", a sentence for the detail page, and the raw hours (None
+    when the close time is unknown).
+    """
+    if not close_dt:
+        return "", "Close time not available", None
+
+    hours_left = (close_dt - now).total_seconds() / 3600
+    if hours_left > 48:
+        short = f"{int(hours_left / 24)}d"
+    elif hours_left > 0:
+        short = f"{int(hours_left)}h"
+    else:
+        short = "Closed"
+
+    if hours_left > 24:
+        long = f"Market closes in **{int(hours_left / 24)} days** ({close_dt.strftime('%B %d, %Y at %I:%M %p UTC')})"
+    elif hours_left > 0:
+        long = f"Market closes in **{int(hours_left)} hours** ({close_dt.strftime('%B %d at %I:%M %p UTC')})"
+    else:
+        long = f"Market closed {close_dt.strftime('%B %d, %Y at %I:%M %p UTC')}"
+    return short, long, hours_left
 
 
 def render_top_nav(current_page: str = "list", current_sport: str = "all"):
@@ -377,7 +373,8 @@ def render_top_nav(current_page: str = "list", current_sport: str = "all"):
             st.markdown('<div style="font-size: 1.5rem; font-weight: 700; color: #f1f5f9; padding: 0.75rem 0;">📊 OddSense</div>', unsafe_allow_html=True)
 
         with col2:
-            # Create sport filter buttons
+            # Sport filter buttons: switching keeps the Streamlit session;
+            # the callback runs before the rerun, so no st.rerun() is needed
             btn_cols = st.columns([1, 1, 1, 1, 1])
             
             sports = [
@@ -395,13 +392,42 @@ def render_top_nav(current_page: str = "list", current_sport: str = "all"):
                         st.markdown(f'<div style="background: #6366f1; color: white; border: 1px solid #6366f1; padding: 0.5rem 1rem; border-radius: 6px; text-align: center; font-weight: 600; font-size: 0.9rem;">{sport_label}</div>', unsafe_allow_html=True)
                     else:
                         # Inactive button
-                        if st.button(sport_label, key=f"nav_{sport_key}", use_container_width=True):
-                            qp_set(page="list", sport=sport_key)
-                            st.rerun()
+                        st.button(sport_label, key=f"nav_{sport_key}",
+                                  use_container_width=True,
+                                  on_click=_switch_sport, args=(sport_key,))
 
         st.markdown('<hr style="margin: 1rem 0; border-color: #334155;">', unsafe_allow_html=True)
 
 
+def _switch_sport(sport: str):
+    """Nav callback: show the list for a sport, starting from page 1."""
+    st.session_state.p = 1
+    qp_set(page="list", sport=sport, p=1)
+
+
+# Odds quality buckets, ordered by ascending lower bound (in percent)
+_QUALITY_THRESHOLDS = np.array([25, 40, 60, 75])
+_QUALITY_BUCKETS = (
+    ("Long Shot", "odds-excellent", "Upset potential at "),
+    ("Underdog", "odds-good", "Underdog with value at "),
+    ("Toss-Up", "odds-neutral", "Close race at "),
+    ("Favorite", "odds-good", "Favored to win at "),
+    ("Strong Favorite", "odds-excellent", "Heavy favorite at "),
+)
+_UNKNOWN_QUALITY = ("Unknown", "odds-neutral", "No data")
+
+
+def classify_odds_quality(probs: np.ndarray) -> np.ndarray:
+    """
+    Bucket a whole array of probabilities in one pass.
+
+    Returns int8 indices into _QUALITY_BUCKETS, with -1 where the
+    probability is missing (NaN).
+    """
+    buckets = np.searchsorted(_QUALITY_THRESHOLDS, probs * 100, side="right")
+    return np.where(np.isnan(probs), -1, buckets).astype(np.int8)
+
+
 def get_odds_quality(prob: Optional[float]) -> tuple[str, str, str]:
     """
     Determine odds quality and return (category, css_class, description).
@@ -414,37 +440,53 @@ def get_odds_quality(prob: Optional[float]) -> tuple[str, str, str]:
     - Long shot (<25%): Excellent - high risk but potential high reward
     """
     if prob is None:
-        return ("Unknown", "odds-neutral", "No data")
-
-    pct_val = prob * 100
-
-    if pct_val >= 75:
-        return ("Strong Favorite", "odds-excellent",
-                f"Heavy favorite at {pct_val:.0f}%")
-    elif pct_val >= 60:
-        return ("Favorite", "odds-good", f"Favored to win at {pct_val:.0f}%")
-    elif pct_val >= 40:
-        return ("Toss-Up", "odds-neutral", f"Close race at {pct_val:.0f}%")
-    elif pct_val >= 25:
-        return ("Underdog", "odds-good",
-                f"Underdog with value at {pct_val:.0f}%")
-    else:
-        return ("Long Shot", "odds-excellent",
-                f"Upset potential at {pct_val:.0f}%")
+        return _UNKNOWN_QUALITY
+    if np.isnan(prob):
+        # NaN fails every threshold, so it has always read as a long shot
+        label, css_class, desc = _QUALITY_BUCKETS[0]
+        return (label, css_class, desc + "nan%")
+    # Kalshi prices are whole cents, so this key has ~100 distinct values
+    return _odds_quality_for_pct(round(prob * 100, 2))
+
+
+@functools.lru_cache(maxsize=128)
+def _odds_quality_for_pct(pct_val: float) -> tuple[str, str, str]:
+    label, css_class, desc = _QUALITY_BUCKETS[int(
+        np.searchsorted(_QUALITY_THRESHOLDS, pct_val, side="right"))]
+    pct_str = (_PCT_STR[round(pct_val)]
+               if 0 <= pct_val <= 100 else f"{pct_val:.0f}%")
+    return (label, css_class, desc + pct_str)
+
+
+@st.cache_resource
+def _context_session() -> requests.Session:
+    """Keep-alive HTTP session for the context service, shared across reruns."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    return session
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_context(game_id: str, include_llm: bool = True) -> dict:
+    """Fetch game context from the context service; raises on failure."""
+    r = _context_session().get(
+        f"{CONTEXT_URL}/context",
+        params={
+            "game_id": game_id,
+            "include_llm": str(include_llm).lower()
+        },
+        timeout=45,
+    )
+    r.raise_for_status()
+    return r.json()
 
 
 def call_context(game_id: str, include_llm: bool = True) -> Optional[dict]:
     try:
-        r = requests.get(
-            f"{CONTEXT_URL}/context",
-            params={
-                "game_id": game_id,
-                "include_llm": str(include_llm).lower()
-            },
-            timeout=45,
-        )
-        r.raise_for_status()
-        return r.json()
+        return _fetch_context(game_id, include_llm)
     except requests.exceptions.ConnectionError:
         st.error(
             f"Context service not reachable at {CONTEXT_URL}. "
@@ -456,6 +498,48 @@ def call_context(game_id: str, include_llm: bool = True) -> Optional[dict]:
         return None
 
 
+@st.cache_resource
+def _gemini() -> GeminiService:
+    """Single Gemini client shared across reruns and sessions."""
+    return GeminiService()
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_game_summary(away_team: str, home_team: str,
+                        kalshi_prob: Optional[float],
+                        sportsbook_prob: Optional[float],
+                        game_date: Optional[str]) -> str:
+    """Generate the AI game preview; raises on failure so it isn't cached."""
+    summary = _gemini().generate_game_summary(away_team=away_team,
+                                              home_team=home_team,
+                                              kalshi_prob=kalshi_prob,
+                                              sportsbook_prob=sportsbook_prob,
+                                              game_date=game_date)
+    if not summary:
+        raise RuntimeError("no game summary generated")
+    return summary
+
+
+def get_game_summary(away_team: str, home_team: str,
+                     kalshi_prob: Optional[float],
+                     sportsbook_prob: Optional[float],
+                     game_date: Optional[str]) -> Optional[str]:
+    """
+    Cached AI game preview, or None when generation fails.
+
+    Probabilities are rounded to whole percentage points (what the prompt
+    shows) so small bid moves don't trigger a new LLM call.
+    """
+    try:
+        return _fetch_game_summary(
+            away_team, home_team,
+            None if kalshi_prob is None else round(kalshi_prob, 2),
+            None if sportsbook_prob is None else round(sportsbook_prob, 2),
+            game_date)
+    except RuntimeError:
+        return None
+
+
 def pick_display_label_and_bid(w: dict) -> tuple[str, Optional[float]]:
     """
     Only show one bid (%) per game:
@@ -473,22 +557,231 @@ def pick_display_label_and_bid(w: dict) -> tuple[str, Optional[float]]:
     return f"{team} — Yes", None
 
 
+def contract_win_prob(contract: dict) -> Optional[float]:
+    """
+    Implied win probability for a winner contract.
+
+    Kalshi reports a 0 bid when nobody is bidding, so an empty bid falls back
+    to last_price (thin markets) rather than reading as a 0% chance.
+    """
+    yes_bid = contract.get('yes_bid')
+    return yes_bid if yes_bid else contract.get('last_price')
+
+
+def _probs_by_team_code(
+    winner_contracts: list[dict], event_ticker: str
+) -> tuple[Optional[float], Optional[float]]:
+    """
+    (away, home) win probabilities from winner contracts whose ticker ends
+    in a team code, e.g. KXNFLGAME-25NOV09-ATL-IND-B-{TEAM}-WIN.
+
+    Contracts are indexed by code in one pass. A contract naming both teams
+    is skipped, and a missing price falls through to the next candidate.
+    """
+    # Team codes from the event ticker (e.g. KXNFLGAME-25NOV09ATLIND -> ATL, IND);
+    # the last two are usually away, home
+    codes = _TEAM_CODE_RE.findall((event_ticker or '').upper())
+    if len(codes) < 2:
+        return None, None
+    away_code, home_code = codes[-2], codes[-1]
+
+    by_team_code = {}
+    for contract in winner_contracts:
+        ticker_parts = (contract.get('ticker', '') or '').upper().split('-')
+        # Check last 3 parts for team codes (before WIN suffix)
+        relevant_parts = set(ticker_parts[-3:])
+        for tok in relevant_parts:
+            if 2 <= len(tok) <= 3 and tok.isalpha():
+                by_team_code.setdefault(tok, []).append(
+                    (contract, relevant_parts))
+
+    def _code_prob(code, other_code):
+        # First contract naming this team but not the other
+        for contract, parts in by_team_code.get(code, ()):
+            if other_code in parts:
+                continue
+            prob = contract_win_prob(contract)
+            if prob is not None:
+                return prob
+        return None
+
+    return _code_prob(away_code, home_code), _code_prob(home_code, away_code)
+
+
+def summarize_card_odds(
+    events: list[dict]
+) -> list[tuple[str, Optional[float], str, tuple[str, str, str]]]:
+    """
+    Compute (label, bid, prob_pct, odds_quality) for a batch of events.
+
+    Percent strings and quality buckets are computed in one vectorized pass
+    over all bids instead of per card.
+    """
+    picks = [
+        pick_display_label_and_bid(ev.get("winner_primary", {}) or {})
+        for ev in events
+    ]
+    bids = np.array([np.nan if b is None else b for _, b in picks],
+                    dtype=float)
+    missing = np.isnan(bids)
+    # Table lookup of whole percentages (bids are clamped to [0, 1])
+    pct_idx = np.rint(np.clip(np.where(missing, 0, bids), 0, 1) * 100)
+    pct_strs = _PCT_ARR[pct_idx.astype(np.intp)]
+    prob_pcts = np.where(missing | (bids == 0), "—", pct_strs)
+    buckets = classify_odds_quality(bids)
+
+    out = []
+    for (label, bid_val), prob_pct, pct_str, bucket in zip(
+            picks, prob_pcts, pct_strs, buckets):
+        if bucket < 0:
+            quality = _UNKNOWN_QUALITY
+        else:
+            q_label, q_class, q_desc = _QUALITY_BUCKETS[bucket]
+            quality = (q_label, q_class, q_desc + pct_str)
+        out.append((label, bid_val, str(prob_pct), quality))
+    return out
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_game_odds(sport: str, away: str,
+                     home: str) -> tuple[Optional[dict], dict[str, float]]:
+    """Sportsbook game for a matchup and its consensus, cached per matchup."""
+    odds_api = get_odds_api(sport)
+    game_odds = odds_api.find_game_by_teams(away, home)
+    consensus = odds_api.get_market_consensus(game_odds) if game_odds else {}
+    return game_odds, consensus
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_consensus_by_pair(
+    pairs: tuple[tuple[str, str, str], ...]
+) -> dict[tuple[str, str, str], dict[str, float]]:
+    """
+    Sportsbook consensus for every (sport, away, home) on a page at once.
+
+    Each sport's odds feed is pulled once (concurrently across sports) and
+    then matched locally, instead of one lookup per rendered card.
+    """
+    sports = sorted({sport for sport, _, _ in pairs})
+    services = {sport: get_odds_api(sport) for sport in sports}
+    if sports:
+        with _thread_pool(max_workers=len(sports)) as ex:
+            list(ex.map(lambda svc: svc.get_odds(), services.values()))
+
+    consensus_by_pair = {}
+    for sport, away, home in pairs:
+        try:
+            consensus_by_pair[(sport, away, home)] = _fetch_game_odds(
+                sport, away, home)[1]
+        except Exception:
+            # Silently fail - odds might not be available yet
+            consensus_by_pair[(sport, away, home)] = {}
+    return consensus_by_pair
+
+
+def build_market_card_html(ev: dict, label: str, bid_val: Optional[float],
+                           prob_pct: str, quality: tuple[str, str, str],
+                           consensus: dict[str, float],
+                           now: datetime) -> str:
+    """Build the list-page market card HTML for a single event."""
+    event_sport = ev.get("_sport", "nfl")
+    w = ev.get("winner_primary", {}) or {}
+    quality_label, quality_class, quality_desc = quality
+
+    # Determine card border color
+    card_class = quality_class.replace("odds-", "market-card-")
+
+    # Create custom HTML card for better mobile UX
+    matchup = ev.get(
+        "pretty_event") or f"{ev['away_team']} @ {ev['home_team']}"
+
+    time_left_str, _, _ = format_time_left(ev.get('close_dt'), now)
+
+    # Format volume and open interest
+    volume_24h = ev.get('volume_24h_sum', 0)
+    volume_str = f"${volume_24h:,.0f}" if volume_24h >= 1000 else f"${volume_24h:.0f}"
+
+    open_interest = ev.get('open_interest_sum', 0)
+    oi_str = f"{open_interest:,.0f}" if open_interest >= 1000 else f"{open_interest:.0f}"
+
+    # Sportsbook odds for comparison (prefetched for the whole page)
+    sportsbook_str = ""
+    away_team_name = ev.get("away_team", "")
+    home_team_name = ev.get("home_team", "")
+
+    # Determine which team the primary contract is for
+    subject_team = w.get('subject_team', '')
+
+    # Get sportsbook average for the same team
+    if subject_team == away_team_name and away_team_name in consensus:
+        sportsbook_str = f"{consensus[away_team_name]:.0f}%"
+    elif subject_team == home_team_name and home_team_name in consensus:
+        sportsbook_str = f"{consensus[home_team_name]:.0f}%"
+
+    # Determine value class
+    if 'excellent' in quality_class or (bid_val and (bid_val >= 0.75
+                                                     or bid_val <= 0.25)):
+        value_class = 'strong'
+    elif 'good' in quality_class:
+        value_class = 'moderate'
+    else:
+        value_class = 'weak'
+
+    # Build metrics HTML
+    time_metric = f'<span title="Time until market closes">⏱️ {time_left_str}</span>' if time_left_str else ''
+    sportsbook_metric = f'<span title="Sportsbook consensus average">🎲 {sportsbook_str}</span>' if sportsbook_str else ''
+
+    # Detail link - use event's actual sport, not current filter
+    details_link = f'<a class="card-link" href="?page=detail&event={ev["event_ticker"]}&sport={event_sport}" target="_self">📊 View Details</a>'
+
+    # Build card HTML as a single line to avoid Streamlit parsing issues
+    card_html = f'<div class="market-card {card_class}"><div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 0.5rem;"><div style="flex: 1;"><div style="font-size: 1.1rem; font-weight: 600; margin-bottom: 0.25rem; color: #f1f5f9;">{matchup}</div><div style="font-size: 0.85rem; color: #94a3b8; margin-bottom: 0.5rem;">{label}</div><div class="market-metrics"><span title="24-hour trading volume">📊 {volume_str}</span><span title="Open interest (total contracts)">📈 {oi_str}</span>{time_metric}{sportsbook_metric}</div></div><div style="text-align: right;"><div class="prob-badge {quality_class}">{prob_pct}</div><div class="value-indicator value-{value_class}">{quality_label}</div></div></div>{details_link}</div>'
+    return card_html
+
+
+def render_market_cards(
+        page_events: list[dict], now: datetime,
+        consensus_by_pair: dict[tuple[str, str, str], dict[str, float]]):
+    """Render a page of market cards (with detail links) as one element."""
+    card_odds = summarize_card_odds(page_events)
+    st.markdown("".join([
+        build_market_card_html(
+            ev, *odds,
+            consensus_by_pair.get(
+                (ev.get("_sport", "nfl"), ev["away_team"], ev["home_team"]),
+                {}), now)
+        for ev, odds in zip(page_events, card_odds)
+    ]), unsafe_allow_html=True)
+
+
 def page_list():
-    from sport_config import get_all_sports, is_valid_sport
-    
     current_sport = qp_get("sport", "all")
     render_top_nav("list", current_sport)
+    render_market_list(current_sport)
+
+
+@st.fragment
+def render_market_list(current_sport: str):
+    """Filters, market cards and pager; filter changes rerun only this part."""
+    from sport_config import get_all_sports, is_valid_sport
 
-    with st.sidebar:
-        st.subheader("Filters")
+    # Filters live in the fragment (fragments can't own sidebar widgets)
+    col_search, col_per, col_refresh = st.columns(
+        [4, 2, 2], vertical_alignment="bottom")
+    with col_search:
         st.session_state.search = st.text_input("Search teams/market text",
                                                 st.session_state.search)
+    with col_per:
         st.session_state.events_per_page = st.number_input(
             "Events per page",
             min_value=6,
             max_value=50,
             step=2,
             value=st.session_state.events_per_page)
+    with col_refresh:
+        if st.button("🔄 Refresh markets", use_container_width=True):
+            # Cleared before the fetch below, so this run already reloads
+            _fetch_events.clear()
 
     # Fetch events based on selected sport
     if current_sport == "all":
@@ -496,43 +789,23 @@ def page_list():
         events = []
         for sport in get_all_sports():
             try:
-                kalshi = get_kalshi(sport)
-                sport_events = kalshi.fetch_and_group_open_games()
-                # Annotate events with sport metadata
-                for ev in sport_events:
-                    ev["_sport"] = sport
+                sport_events, _ = _fetch_events(sport)
                 events.extend(sport_events)
             except Exception as e:
                 st.warning(f"Error fetching {sport.upper()} markets: {e}")
     else:
         # Fetch events for specific sport
         if is_valid_sport(current_sport):
-            kalshi = get_kalshi(current_sport)
-            events = kalshi.fetch_and_group_open_games()
-            # Annotate events with sport metadata
-            for ev in events:
-                ev["_sport"] = current_sport
+            events, _ = _fetch_events(current_sport)
         else:
             st.error(f"Invalid sport: {current_sport}")
             events = []
 
     # Search
     q = (st.session_state.search or "").lower().strip()
-    if q:
-
-        def match(ev):
-            if q in (ev["pretty_event"] or "").lower():
-                return True
-            if q in ev["home_team"].lower() or q in ev["away_team"].lower():
-                return True
-            for m in ev["all_contracts"]:
-                t = " ".join([m.get("title") or "",
-                              m.get("subtitle") or ""]).lower()
-                if q in t:
-                    return True
-            return False
-
-        events = [e for e in events if match(e)]
+    if q and events:
+        hits = _search_hits(tuple(e["_search_blob"] for e in events), q)
+        events = [events[i] for i in hits]
 
     # Pagination
     total = len(events)
@@ -544,119 +817,246 @@ def page_list():
     st.caption(f"📊 {total} games • Page {p}/{pages}")
 
     # Mobile-optimized market cards
-    for ev in events[start:end]:
-        # Get sport-specific odds API service for this event
-        event_sport = ev.get("_sport", "nfl")
-        odds_api = get_odds_api(event_sport)
-        w = ev.get("winner_primary", {}) or {}
-        label, bid_val = pick_display_label_and_bid(w)
-
-        # Get odds quality
-        quality_label, quality_class, quality_desc = get_odds_quality(bid_val)
-
-        # Determine card border color
-        card_class = quality_class.replace("odds-", "market-card-")
-
-        # Create custom HTML card for better mobile UX
-        matchup = ev.get(
-            "pretty_event") or f"{ev['away_team']} @ {ev['home_team']}"
-        prob_pct = f"{bid_val*100:.0f}%" if bid_val else "—"
-
-        # Calculate time left
-        close_dt = ev.get('close_dt')
-        time_left_str = ""
-        if close_dt:
-            now = datetime.now(timezone.utc)
-            time_diff = close_dt - now
-            hours_left = time_diff.total_seconds() / 3600
-
-            if hours_left > 48:
-                days_left = int(hours_left / 24)
-                time_left_str = f"{days_left}d"
-            elif hours_left > 0:
-                time_left_str = f"{int(hours_left)}h"
+    page_events = events[start:end]
+    consensus_by_pair = _fetch_consensus_by_pair(tuple(sorted({
+        (ev.get("_sport", "nfl"), ev["away_team"], ev["home_team"])
+        for ev in page_events if ev.get("away_team") and ev.get("home_team")
+    })))
+    # One clock reading for every card on the page
+    render_market_cards(page_events, datetime.now(timezone.utc),
+                        consensus_by_pair)
+
+    # Pager: buttons keep this Streamlit session (and its user_session_id);
+    # the callbacks run before the fragment reruns, so a click is one run
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if p > 1:
+            st.button("⬅️ Previous", use_container_width=True,
+                      on_click=_go_to_page, args=(p - 1, per))
+    with col2:
+        st.markdown(
+            f"<div style='text-align: center; padding: 0.5rem; color: #94a3b8;'>Page {p}/{pages}</div>",
+            unsafe_allow_html=True)
+    with col3:
+        if p < pages:
+            st.button("Next ➡️", use_container_width=True,
+                      on_click=_go_to_page, args=(p + 1, per))
+
+
+def _go_to_page(n: int, per: int):
+    """Pager callback: move to page n and mirror the list state into the URL."""
+    st.session_state.p = n
+    params = {"page": "list", "p": n}
+    if st.session_state.search:
+        params["q"] = st.session_state.search
+    if per != 12:
+        params["per"] = per
+    qp_set(**params)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _auto_game_id(event_ticker: str, sport: str, away: str, home: str,
+                  close_dt_iso: Optional[str]) -> Optional[str]:
+    """
+    ESPN game_id for an event, keyed on the ISO form of the close time.
+
+    Resolved ids are stored on the event's Game row, so only the first
+    lookup for a ticker scans ESPN scoreboards. The database is optional
+    here: if it is unavailable the id is resolved from ESPN every time.
+    """
+    try:
+        game_id = get_prediction_service().get_espn_event_id(event_ticker)
+    except Exception:
+        game_id = None
+    if game_id:
+        return game_id
+
+    close_dt = (pd.Timestamp(close_dt_iso).to_pydatetime()
+                if close_dt_iso else None)
+    game_id = find_game_id(away, home, close_dt)
+    if game_id:
+        try:
+            get_prediction_service().save_espn_event_id(
+                event_ticker, sport, home, away, game_id,
+                game_date=close_dt, close_date=close_dt)
+        except Exception:
+            pass
+    return game_id
+
+
+@st.fragment
+def render_context_section(ev: dict):
+    """Game-context controls; reruns on their own, not the whole detail page."""
+    close_dt = ev["close_dt"]
+    auto_game_id = _auto_game_id(ev["event_ticker"], ev.get("_sport", "nfl"),
+                                 ev["away_team"], ev["home_team"],
+                                 close_dt.isoformat() if close_dt else None)
+    with st.expander("Game mapping details"):
+        st.write({
+            "away_team": ev["away_team"],
+            "home_team": ev["home_team"],
+            "kalshi_close_dt": str(ev["close_dt"]),
+            "auto_resolved_game_id": auto_game_id,
+            "context_url": CONTEXT_URL,
+        })
+
+    game_id = st.text_input("ESPN game_id", value=auto_game_id or "")
+    colL, colR = st.columns([1, 5])
+    with colL:
+        run = st.button("Generate Context")
+
+    if run and game_id:
+        data = call_context(game_id, include_llm=True)
+        if data:
+            if data.get("llm", {}).get("summary_md"):
+                st.markdown("### Analyst Brief")
+                st.markdown(data["llm"]["summary_md"])
             else:
-                time_left_str = "Closed"
+                st.info("LLM summary not available; showing facts only.")
+            st.markdown("### Facts (compact)")
+            st.json(data.get("facts", {}))
+
+
+def render_price_history(sport: str, ticker: Optional[str],
+                         price_series: Optional[tuple]):
+    """Price/volume charts for the prefetched (timestamps, closes, volumes)."""
+    if ticker:
+        st.info(
+            "**Understanding price history:** "
+            "This chart shows how the market's implied probability has changed over time. "
+            "Rising prices indicate growing confidence in the outcome, while falling prices suggest decreasing confidence. "
+            "Watch for trends and sudden movements that might indicate new information entering the market."
+        )
 
-        # Format volume and open interest
-        volume_24h = ev.get('volume_24h_sum', 0)
-        volume_str = f"${volume_24h:,.0f}" if volume_24h >= 1000 else f"${volume_24h:.0f}"
+        # Candlestick data as (timestamps, closes, volumes)
+        if price_series is not None:
+            timestamps, closes, volumes = price_series
 
-        open_interest = ev.get('open_interest_sum', 0)
-        oi_str = f"{open_interest:,.0f}" if open_interest >= 1000 else f"{open_interest:.0f}"
+            # Calculate trend (closes are already filtered to real prices)
+            if len(closes) >= 2:
+                c0, cn = float(closes[0]), float(closes[-1])
+                pct_change = 0.0 if c0 <= 0 else (cn - c0) / c0 * 100.0
 
-        # Fetch sportsbook odds for comparison
-        sportsbook_str = ""
-        away_team_name = ev.get("away_team", "")
-        home_team_name = ev.get("home_team", "")
+                if abs(pct_change) > 5:
+                    trend_emoji = "📈" if pct_change > 0 else "📉"
+                    trend_text = f"{trend_emoji} **Market trend:** {'Rising' if pct_change > 0 else 'Falling'} ({pct_change:+.1f}% over the period shown)"
+                else:
+                    trend_text = "➡️ **Market trend:** Stable (minimal movement)"
 
-        if away_team_name and home_team_name:
-            try:
-                game_odds = odds_api.find_game_by_teams(
-                    away_team_name, home_team_name)
-                if game_odds:
-                    consensus = odds_api.get_market_consensus(game_odds)
-                    if consensus:
-                        # Determine which team the primary contract is for
-                        subject_team = w.get('subject_team', '')
-
-                        # Get sportsbook average for the same team
-                        if subject_team == away_team_name and away_team_name in consensus:
-                            avg_prob = consensus[away_team_name]
-                            sportsbook_str = f"{avg_prob:.0f}%"
-                        elif subject_team == home_team_name and home_team_name in consensus:
-                            avg_prob = consensus[home_team_name]
-                            sportsbook_str = f"{avg_prob:.0f}%"
-            except Exception:
-                # Silently fail - odds might not be available yet
-                pass
-
-        # Determine value class
-        if 'excellent' in quality_class or (bid_val and (bid_val >= 0.75
-                                                         or bid_val <= 0.25)):
-            value_class = 'strong'
-        elif 'good' in quality_class:
-            value_class = 'moderate'
+                st.caption(trend_text)
+
+            # Create price chart only if we have valid data
+            if len(closes) > 0:
+                fig, fig_vol = _build_price_figures(
+                    sport, ticker,
+                    _price_series_key(timestamps, closes, volumes),
+                    timestamps, closes, volumes)
+                st.plotly_chart(fig, use_container_width=True)
+
+                # Volume chart
+                if fig_vol is not None:
+                    with st.expander("📊 View Volume History"):
+                        st.caption(
+                            "**Volume spikes** can indicate important news or events affecting trader sentiment."
+                        )
+                        st.plotly_chart(fig_vol, use_container_width=True)
+            else:
+                st.info(
+                    "Historical price data contains no valid close prices. This can happen for newly created markets."
+                )
         else:
-            value_class = 'weak'
+            st.info(
+                "Historical price data not yet available for this market. Check back after some trading activity."
+            )
 
-        # Build metrics HTML
-        time_metric = f'<span title="Time until market closes">⏱️ {time_left_str}</span>' if time_left_str else ''
-        sportsbook_metric = f'<span title="Sportsbook consensus average">🎲 {sportsbook_str}</span>' if sportsbook_str else ''
 
-        # Build card HTML as a single line to avoid Streamlit parsing issues
-        card_html = f'<div class="market-card {card_class}"><div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 0.5rem;"><div style="flex: 1;"><div style="font-size: 1.1rem; font-weight: 600; margin-bottom: 0.25rem; color: #f1f5f9;">{matchup}</div><div style="font-size: 0.85rem; color: #94a3b8; margin-bottom: 0.5rem;">{label}</div><div class="market-metrics"><span title="24-hour trading volume">📊 {volume_str}</span><span title="Open interest (total contracts)">📈 {oi_str}</span>{time_metric}{sportsbook_metric}</div></div><div style="text-align: right;"><div class="prob-badge {quality_class}">{prob_pct}</div><div class="value-indicator value-{value_class}">{quality_label}</div></div></div></div>'
+@st.fragment
+def render_orderbook(current_sport: str, ticker: Optional[str]):
+    """Order-book expander; Kalshi is only queried once the user opts in."""
+    with st.expander("📖 Current Order Book", expanded=False):
+        if ticker:
+            st.info(
+                "The order book shows pending buy/sell orders. "
+                "'Yes' orders bet the outcome happens; 'No' orders bet it doesn't."
+            )
+            if not st.toggle("Load order book", key="load_orderbook"):
+                st.caption("Turn on to fetch the live order book from Kalshi.")
+                return
 
-        st.markdown(card_html, unsafe_allow_html=True)
+            orderbook = _fetch_orderbook(current_sport, ticker)
+            if orderbook:
+                col_yes, col_no = st.columns(2)
 
-        # Action button - use event's actual sport, not current filter
-        event_sport = ev.get("_sport", current_sport)
-        st.link_button("📊 View Details",
-                       f"?page=detail&event={ev['event_ticker']}&sport={event_sport}",
-                       use_container_width=True)
-        st.markdown("<br>", unsafe_allow_html=True)
+                with col_yes:
+                    st.markdown("**YES Orders**")
+                    yes_orders = orderbook.get("yes", [])
+                    if yes_orders:
+                        st.dataframe([{
+                            "Price": o.get("price"),
+                            "Size": o.get("size")
+                        } for o in yes_orders[:10]],  # Top 10
+                                     hide_index=True,
+                                     use_container_width=True)
+                    else:
+                        st.caption("No YES orders")
 
-    # Pager
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col1:
-        if p > 1:
-            if st.button("⬅️ Previous", use_container_width=True):
-                st.session_state.p = p - 1
-                qp_set(page="list")
-                st.rerun()
-    with col2:
-        st.markdown(
-            f"<div style='text-align: center; padding: 0.5rem; color: #94a3b8;'>Page {p}/{pages}</div>",
-            unsafe_allow_html=True)
-    with col3:
-        if p < pages:
-            if st.button("Next ➡️", use_container_width=True):
-                st.session_state.p = p + 1
-                qp_set(page="list")
-                st.rerun()
+                with col_no:
+                    st.markdown("**NO Orders**")
+                    no_orders = orderbook.get("no", [])
+                    if no_orders:
+                        st.dataframe([{
+                            "Price": o.get("price"),
+                            "Size": o.get("size")
+                        } for o in no_orders[:10]],  # Top 10
+                                     hide_index=True,
+                                     use_container_width=True)
+                    else:
+                        st.caption("No NO orders")
+            else:
+                st.info("Order book data not available.")
+        else:
+            st.info("No ticker available for order book.")
+
+
+@st.fragment
+def render_team_leaders(current_sport: str, away_team_name: str,
+                        home_team_name: str):
+    """Stat-leader expander; ESPN is only queried once the user opts in."""
+    with st.expander("View Key Player Stats", expanded=False):
+        if not st.toggle("Load team stat leaders", key="load_team_leaders"):
+            st.caption("Turn on to fetch the latest leaders from ESPN.")
+            return
+
+        from sport_config import get_sport_config
+        
+        # Get sport-specific stat category (first one from config)
+        sport_config = get_sport_config(current_sport)
+        stat_category = sport_config.get("stat_categories", ["passing"])[0]
+        
+        # Both teams' leaders are independent ESPN calls; fetch together
+        with _thread_pool(max_workers=2) as ex:
+            leader_futures = [
+                ex.submit(_fetch_team_leaders, current_sport, team,
+                          stat_category)
+                for team in (away_team_name, home_team_name)
+            ]
+            all_leaders = [f.result() for f in leader_futures]
+
+        cols = st.columns(2)
+        for col, team, leaders in zip(cols, (away_team_name, home_team_name),
+                                      all_leaders):
+            with col:
+                st.markdown(f"**{team}**")
+                if leaders:
+                    for leader in leaders[:3]:  # Top 3
+                        st.write(
+                            f"• **{leader.get('name')}** ({leader.get('position')}): {leader.get('value')}"
+                        )
+                else:
+                    st.caption("Stats unavailable")
 
 
-def page_detail():
+def page_detail(pool: ThreadPoolExecutor):
     from sport_config import is_valid_sport, get_all_sports
     
     # Get event ticker first
@@ -674,9 +1074,8 @@ def page_detail():
         found_sport = None
         for sport in get_all_sports():
             try:
-                kalshi = get_kalshi(sport)
-                events = kalshi.fetch_and_group_open_games()
-                if any(e["event_ticker"] == event_ticker for e in events):
+                _, events_by_ticker = _fetch_events(sport)
+                if event_ticker in events_by_ticker:
                     found_sport = sport
                     break
             except Exception:
@@ -690,10 +1089,8 @@ def page_detail():
     
     render_top_nav("detail", current_sport)
 
-    # Get sport-specific services
-    kalshi = get_kalshi(current_sport)
-    events = kalshi.fetch_and_group_open_games()
-    ev = next((e for e in events if e["event_ticker"] == event_ticker), None)
+    _, events_by_ticker = _fetch_events(current_sport)
+    ev = events_by_ticker.get(event_ticker)
     if not ev:
         st.error("Event not found (may have closed).")
         return
@@ -703,20 +1100,49 @@ def page_detail():
 
     # Enhanced event context
     close_dt = ev.get('close_dt')
-    if close_dt:
-        now = datetime.now(timezone.utc)
-        time_diff = close_dt - now
-        hours_left = time_diff.total_seconds() / 3600
-
-        if hours_left > 24:
-            days_left = int(hours_left / 24)
-            time_desc = f"Market closes in **{days_left} days** ({close_dt.strftime('%B %d, %Y at %I:%M %p UTC')})"
-        elif hours_left > 0:
-            time_desc = f"Market closes in **{int(hours_left)} hours** ({close_dt.strftime('%B %d at %I:%M %p UTC')})"
-        else:
-            time_desc = f"Market closed {close_dt.strftime('%B %d, %Y at %I:%M %p UTC')}"
+    # One timestamp per render, shared by every section below
+    now = datetime.now(timezone.utc)
+    time_left_str, time_desc, _ = format_time_left(close_dt, now)
+
+    away_team_name = ev.get("away_team", "")
+    home_team_name = ev.get("home_team", "")
+    # Primary winner contract, shared by the AI preview and market sections
+    w = ev.get("winner_primary", {}) or {}
+    label, bid_val = pick_display_label_and_bid(w)
+    # Canonical forms for the name matching further down
+    away_c, home_c, label_c = (_canon(away_team_name), _canon(home_team_name),
+                               _canon(label))
+    ticker = w.get("ticker")
+    game_finished = bool(close_dt) and now > close_dt
+
+    # The team the primary contract's label names ("<TEAM> — Yes/No"), if any
+    if away_c in label_c:
+        labeled_team = "away"
+    elif home_c in label_c:
+        labeled_team = "home"
     else:
-        time_desc = "Close time not available"
+        labeled_team = None
+    # The ESPN comparison needs a finished game and a priced, labeled contract
+    needs_result = game_finished and bid_val is not None and bool(labeled_team)
+
+    # Sportsbook odds, Kalshi candles, the ESPN result and the
+    # prediction lookups come from different hosts: fetch them together on
+    # the caller's pool and collect each where it's drawn, so sections above
+    # a slow fetch render while it is still in flight
+    prediction_service = get_prediction_service()
+    user_session_id = st.session_state.get("user_session_id", "")
+    odds_future = pool.submit(_fetch_game_odds, current_sport, away_team_name,
+                              home_team_name)
+    series_future = (pool.submit(_fetch_price_series, current_sport, ticker)
+                     if ticker else None)
+    result_future = (pool.submit(_fetch_game_result, current_sport,
+                                 away_team_name, home_team_name,
+                                 close_dt.isoformat())
+                     if needs_result else None)
+    user_prediction_future = pool.submit(
+        prediction_service.get_user_prediction, user_session_id, event_ticker)
+    community_future = pool.submit(prediction_service.get_community_consensus,
+                                   event_ticker)
 
     st.caption(time_desc)
 
@@ -737,46 +1163,30 @@ def page_detail():
                   help="Outstanding contracts (positions not yet closed)")
 
     with metric_cols[2]:
-        if close_dt:
-            hours_left = (close_dt -
-                          datetime.now(timezone.utc)).total_seconds() / 3600
-            if hours_left > 0:
-                st.metric("Time Left",
-                          f"{int(hours_left)}h"
-                          if hours_left < 48 else f"{int(hours_left/24)}d",
-                          help="Time until market closes")
-            else:
-                st.metric("Status", "Closed", help="Market has closed")
+        if time_left_str == "Closed":
+            st.metric("Status", "Closed", help="Market has closed")
+        elif time_left_str:
+            st.metric("Time Left",
+                      time_left_str,
+                      help="Time until market closes")
 
     st.divider()
 
     # AI-Generated Game Preview
     st.subheader("🤖 AI Game Preview")
     with st.spinner("Generating AI-powered game analysis..."):
-        gemini = GeminiService()
-        away_team_name = ev.get("away_team", "")
-        home_team_name = ev.get("home_team", "")
-
-        # Get primary contract probability
-        w_temp = ev.get("winner_primary", {}) or {}
-        _, primary_prob = pick_display_label_and_bid(w_temp)
-
         # Try to get sportsbook odds for context
         sportsbook_prob = None
         try:
-            odds_api = get_odds_api(current_sport)
-            game_odds = odds_api.find_game_by_teams(away_team_name,
-                                                    home_team_name)
-            if game_odds:
-                consensus = odds_api.get_market_consensus(game_odds)
-                if consensus:
-                    subject_team = w_temp.get('subject_team', '')
-                    if subject_team == away_team_name and away_team_name in consensus:
-                        sportsbook_prob = consensus[
-                            away_team_name] / 100  # Convert percentage to decimal
-                    elif subject_team == home_team_name and home_team_name in consensus:
-                        sportsbook_prob = consensus[
-                            home_team_name] / 100  # Convert percentage to decimal
+            _, consensus = odds_future.result()
+            if consensus:
+                subject_team = w.get('subject_team', '')
+                if subject_team == away_team_name and away_team_name in consensus:
+                    sportsbook_prob = consensus[
+                        away_team_name] / 100  # Convert percentage to decimal
+                elif subject_team == home_team_name and home_team_name in consensus:
+                    sportsbook_prob = consensus[
+                        home_team_name] / 100  # Convert percentage to decimal
         except Exception:
             pass
 
@@ -785,11 +1195,8 @@ def page_detail():
         if close_dt:
             game_date = close_dt.strftime('%B %d, %Y')
 
-        summary = gemini.generate_game_summary(away_team=away_team_name,
-                                               home_team=home_team_name,
-                                               kalshi_prob=primary_prob,
-                                               sportsbook_prob=sportsbook_prob,
-                                               game_date=game_date)
+        summary = get_game_summary(away_team_name, home_team_name, bid_val,
+                                   sportsbook_prob, game_date)
 
         if summary:
             # Format the AI preview with better typography and spacing
@@ -820,16 +1227,11 @@ def page_detail():
     st.divider()
     st.subheader("🎯 Make Your Prediction")
     
-    prediction_service = PredictionService()
-    user_session_id = st.session_state.get("user_session_id", "")
-    
-    # Get existing prediction if any
-    existing_prediction = prediction_service.get_user_prediction(
-        user_session_id, event_ticker
-    )
-    
-    # Get community consensus
-    community_data = prediction_service.get_community_consensus(event_ticker)
+    # Existing prediction (if any) and community consensus
+    existing_prediction = _collect(user_prediction_future, None,
+                                   "Could not load your prediction")
+    community_data = _collect(community_future, None,
+                              "Could not load community predictions")
     
     # Prediction form
     col1, col2 = st.columns([2, 1])
@@ -873,7 +1275,7 @@ def page_detail():
                     away_team=away_team_name,
                     predicted_winner=predicted_winner,
                     confidence=float(confidence),
-                    kalshi_prob=primary_prob,
+                    kalshi_prob=bid_val,
                     sportsbook_consensus=sportsbook_prob,
                     game_date=close_dt,
                     close_date=close_dt
@@ -952,48 +1354,11 @@ def page_detail():
     st.divider()
     st.subheader("⭐ Team Stat Leaders")
 
-    with st.expander("View Key Player Stats", expanded=False):
-        from sport_config import get_sport_config
-        
-        # Get sport-specific stat category (first one from config)
-        sport_config = get_sport_config(current_sport)
-        stat_category = sport_config.get("stat_categories", ["passing"])[0]
-        
-        cols = st.columns(2)
-        espn_service = get_espn(current_sport)
-
-        # Away team leaders
-        with cols[0]:
-            st.markdown(f"**{away_team_name}**")
-            away_leaders = espn_service.get_team_leaders(away_team_name,
-                                                         category=stat_category)
-            if away_leaders:
-                for leader in away_leaders[:3]:  # Top 3
-                    st.write(
-                        f"• **{leader.get('name')}** ({leader.get('position')}): {leader.get('value')}"
-                    )
-            else:
-                st.caption("Stats unavailable")
-
-        # Home team leaders
-        with cols[1]:
-            st.markdown(f"**{home_team_name}**")
-            home_leaders = espn_service.get_team_leaders(home_team_name,
-                                                         category=stat_category)
-            if home_leaders:
-                for leader in home_leaders[:3]:  # Top 3
-                    st.write(
-                        f"• **{leader.get('name')}** ({leader.get('position')}): {leader.get('value')}"
-                    )
-            else:
-                st.caption("Stats unavailable")
+    render_team_leaders(current_sport, away_team_name, home_team_name)
 
     st.divider()
 
     # Winner Market with Visual Indicators
-    w = ev.get("winner_primary", {}) or {}
-    label, bid_val = pick_display_label_and_bid(w)
-
     # Get odds quality for visual indicator
     quality_label, quality_class, quality_desc = get_odds_quality(bid_val)
 
@@ -1027,14 +1392,13 @@ def page_detail():
     st.subheader("📊 Sportsbook Odds vs OddSense Market")
 
     # Initialize SportsGameOdds API service
-    odds_api = OddsAPIService()
-
-    away_team_name = ev.get("away_team", "")
-    home_team_name = ev.get("home_team", "")
+    odds_api = get_odds_api(current_sport)
 
     # Try to fetch real-time betting odds from The Odds API
     with st.spinner("Fetching live betting odds from sportsbooks..."):
-        game_odds = odds_api.find_game_by_teams(away_team_name, home_team_name)
+        # Same lookup the AI preview used above
+        game_odds, consensus = _collect(odds_future, (None, {}),
+                                        "Error fetching sportsbook odds")
 
         if game_odds:
             st.info(
@@ -1043,84 +1407,46 @@ def page_detail():
                 "Differences can reveal arbitrage opportunities or varying market confidence."
             )
 
-            # Get consensus across all sportsbooks
-            consensus = odds_api.get_market_consensus(game_odds)
-
             # Get prediction market probabilities for both teams
             away_kalshi_prob = None
             home_kalshi_prob = None
 
             # Find winner contracts - collect all first, then assign
+            # (kept with their lowercased title for the text matching below)
             winner_contracts = []
             for contract in ev.get('all_contracts', []):
-                title = contract.get('title', '') or ''
+                title_lower = (contract.get('title', '') or '').lower()
                 # Only look at winner markets
-                if 'winner' not in title.lower():
+                if 'winner' not in title_lower:
                     continue
-                winner_contracts.append(contract)
+                winner_contracts.append((contract, title_lower))
 
             # Strategy 1: Try matching by team codes in event ticker
-            event_ticker = ev.get('event_ticker', '')
-            if event_ticker:
-                # Extract team codes from ticker (e.g., KXNFLGAME-25NOV09ATLIND -> ATL, IND)
-                import re
-                codes = re.findall(r'[A-Z]{2,3}', event_ticker.upper())
-                # Last 2 codes are usually away, home
-                if len(codes) >= 2:
-                    away_code, home_code = codes[-2], codes[-1]
-
-                    # Match each winner contract to away or home
-                    # Typical pattern: KXNFLGAME-25NOV09-ATL-IND-B-{TEAM}-WIN
-                    # The team code appears near the end, after the event codes
-                    for contract in winner_contracts:
-                        ticker = (contract.get('ticker', '') or '').upper()
-                        # Fallback chain: yes_bid -> last_price (for thin markets)
-                        prob = contract.get('yes_bid') or contract.get(
-                            'last_price')
-
-                        # Look for pattern like -ATL-WIN or -ATL- near the end
-                        # Split ticker into parts and check last few segments
-                        ticker_parts = ticker.split('-')
-
-                        # Check last 3 parts for team codes (before WIN suffix)
-                        relevant_parts = ticker_parts[-3:] if len(
-                            ticker_parts) >= 3 else ticker_parts
-
-                        # Count occurrences in relevant parts only
-                        away_in_end = away_code in relevant_parts
-                        home_in_end = home_code in relevant_parts
-
-                        if away_in_end and not home_in_end and away_kalshi_prob is None:
-                            away_kalshi_prob = prob
-                        elif home_in_end and not away_in_end and home_kalshi_prob is None:
-                            home_kalshi_prob = prob
+            away_kalshi_prob, home_kalshi_prob = _probs_by_team_code(
+                [contract for contract, _ in winner_contracts],
+                ev.get('event_ticker', ''))
 
             # Strategy 2: If still missing, try text matching
             if away_kalshi_prob is None or home_kalshi_prob is None:
-                for contract in winner_contracts:
+                # Team name parts are the same for every contract. Plain
+                # lowercase, like full_text below
+                away_parts = tuple(
+                    p for p in away_team_name.lower().split() if len(p) > 2)
+                home_parts = tuple(
+                    p for p in home_team_name.lower().split() if len(p) > 2)
+
+                for contract, title_lower in winner_contracts:
                     if away_kalshi_prob is not None and home_kalshi_prob is not None:
                         break
 
-                    title = contract.get('title', '') or ''
-                    subtitle = contract.get('subtitle', '') or ''
-                    full_text = f"{title} {subtitle}".lower()
+                    subtitle = (contract.get('subtitle', '') or '').lower()
+                    full_text = f"{title_lower} {subtitle}"
 
-                    # Fallback chain: yes_bid -> last_price (for thin markets)
-                    prob = contract.get('yes_bid') or contract.get(
-                        'last_price')
+                    prob = contract_win_prob(contract)
 
                     # Match team name parts
-                    away_parts = [
-                        p for p in away_team_name.lower().split() if len(p) > 2
-                    ]
-                    home_parts = [
-                        p for p in home_team_name.lower().split() if len(p) > 2
-                    ]
-
-                    away_matches = sum(1 for part in away_parts
-                                       if part in full_text)
-                    home_matches = sum(1 for part in home_parts
-                                       if part in full_text)
+                    away_matches = sum(part in full_text for part in away_parts)
+                    home_matches = sum(part in full_text for part in home_parts)
 
                     # Assign based on matches
                     if away_matches > home_matches and away_kalshi_prob is None:
@@ -1129,8 +1455,7 @@ def page_detail():
                         home_kalshi_prob = prob
                     elif away_matches == home_matches and away_matches > 0:
                         # Tie - check for "Yes" in title to identify the team
-                        if '— yes' in full_text.lower(
-                        ) or 'yes' in subtitle.lower():
+                        if '— yes' in full_text or 'yes' in subtitle:
                             # This is likely the primary team - assign to first missing
                             if away_kalshi_prob is None:
                                 away_kalshi_prob = prob
@@ -1138,17 +1463,16 @@ def page_detail():
                                 home_kalshi_prob = prob
 
             # Strategy 3: Use winner_primary as fallback
-            if away_kalshi_prob is None or home_kalshi_prob is None:
-                winner_primary = ev.get('winner_primary', {})
-                primary_team = winner_primary.get('subject_team', '')
-                primary_bid = winner_primary.get('yes_bid')
-
-                if primary_bid is not None:
-                    # Determine if primary is away or home
-                    if primary_team == away_team_name and away_kalshi_prob is None:
-                        away_kalshi_prob = primary_bid
-                    elif primary_team == home_team_name and home_kalshi_prob is None:
-                        home_kalshi_prob = primary_bid
+            # (w is the winner_primary contract resolved at the top of the page)
+            primary_bid = w.get('yes_bid')
+            if primary_bid is not None and (away_kalshi_prob is None
+                                            or home_kalshi_prob is None):
+                primary_team = w.get('subject_team', '')
+                # Determine if primary is away or home
+                if primary_team == away_team_name and away_kalshi_prob is None:
+                    away_kalshi_prob = primary_bid
+                elif primary_team == home_team_name and home_kalshi_prob is None:
+                    home_kalshi_prob = primary_bid
 
             # Derive complement if only one found
             if away_kalshi_prob is None and home_kalshi_prob is not None:
@@ -1156,120 +1480,54 @@ def page_detail():
             elif home_kalshi_prob is None and away_kalshi_prob is not None:
                 home_kalshi_prob = 1 - away_kalshi_prob
 
-            # Display comparison table
-            col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
-
-            with col1:
-                st.markdown("**Team**")
-            with col2:
-                st.markdown("**OddSense**")
-            with col3:
-                st.markdown("**Sportsbook Avg**")
-            with col4:
-                st.markdown("**Best Odds**")
-
-            # Away team row
-            col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
-
-            with col1:
-                st.write(f"**{away_team_name}** (Away)")
-
-            with col2:
-                if away_kalshi_prob is not None:
-                    st.metric("", f"{away_kalshi_prob*100:.1f}%")
-                else:
-                    st.write("—")
-
-            with col3:
-                if consensus and away_team_name in consensus:
-                    avg_prob = consensus[away_team_name]
-                    st.metric("", f"{avg_prob:.1f}%")
-                else:
-                    st.write("—")
-
-            with col4:
-                best = odds_api.get_best_odds(game_odds, away_team_name)
-                if best:
-                    st.metric(
-                        "",
-                        f"{best['odds']:+d}",
-                        help=f"{best['bookmaker']}: {best['probability']:.1f}%"
-                    )
-                else:
-                    st.write("—")
-
-            # Home team row
-            col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
-
-            with col1:
-                st.write(f"**{home_team_name}** (Home)")
-
-            with col2:
-                if home_kalshi_prob is not None:
-                    st.metric("", f"{home_kalshi_prob*100:.1f}%")
-                else:
-                    st.write("—")
-
-            with col3:
-                if consensus and home_team_name in consensus:
-                    avg_prob = consensus[home_team_name]
-                    st.metric("", f"{avg_prob:.1f}%")
-                else:
-                    st.write("—")
-
-            with col4:
-                best = odds_api.get_best_odds(game_odds, home_team_name)
-                if best:
-                    st.metric(
-                        "",
-                        f"{best['odds']:+d}",
-                        help=f"{best['bookmaker']}: {best['probability']:.1f}%"
-                    )
-                else:
-                    st.write("—")
+            # Group the bookmaker odds by team once for the lookups below
+            odds_by_team = odds_api.index_by_team(game_odds)
+
+            # Display comparison table as a single pre-formatted table
+            comparison_rows = []
+            for team, side, kalshi_prob in (
+                (away_team_name, "Away", away_kalshi_prob),
+                (home_team_name, "Home", home_kalshi_prob),
+            ):
+                best = odds_api.get_best_odds(odds_by_team, team)
+                avg_prob = consensus.get(team) if consensus else None
+                comparison_rows.append({
+                    "Team": f"{team} ({side})",
+                    "OddSense": (f"{kalshi_prob*100:.1f}%"
+                                 if kalshi_prob is not None else "—"),
+                    "Sportsbook Avg": (f"{avg_prob:.1f}%"
+                                       if avg_prob is not None else "—"),
+                    "Best Odds": (f"{best['odds']:+d} ({best['bookmaker']})"
+                                  if best else "—"),
+                })
+            st.dataframe(comparison_rows,
+                         use_container_width=True,
+                         hide_index=True)
 
             # Show available sportsbooks in an expander
             away_all_odds = odds_api.get_all_bookmaker_odds(
-                game_odds, away_team_name)
+                odds_by_team, away_team_name)
             home_all_odds = odds_api.get_all_bookmaker_odds(
-                game_odds, home_team_name)
+                odds_by_team, home_team_name)
             if away_all_odds or home_all_odds:
                 with st.expander("📋 View All Sportsbook Odds"):
                     st.caption(
                         "**All available odds for this game:**")
 
-                    # Create a dataframe for better display
-                    odds_data = []
-
-                    # Process away team odds
-                    for odd in away_all_odds:
-                        odds_data.append({
-                            'Team':
-                            f"{away_team_name} (Away)",
-                            'Sportsbook':
-                            odd['bookmaker'],
-                            'Odds':
-                            f"{odd['odds']:+d}",
-                            'Win Prob':
-                            f"{odd['probability']:.1f}%"
-                        })
-
-                    # Process home team odds
-                    for odd in home_all_odds:
-                        odds_data.append({
-                            'Team':
-                            f"{home_team_name} (Home)",
-                            'Sportsbook':
-                            odd['bookmaker'],
-                            'Odds':
-                            f"{odd['odds']:+d}",
-                            'Win Prob':
-                            f"{odd['probability']:.1f}%"
-                        })
+                    # Pre-formatted strings, so Streamlit can take the rows
+                    # directly without building a DataFrame
+                    odds_data = [{
+                        'Team': f"{team} ({side})",
+                        'Sportsbook': odd['bookmaker'],
+                        'Odds': f"{odd['odds']:+d}",
+                        'Win Prob': f"{odd['probability']:.1f}%"
+                    } for team, side, team_odds in (
+                        (away_team_name, "Away", away_all_odds),
+                        (home_team_name, "Home", home_all_odds),
+                    ) for odd in team_odds]
 
                     if odds_data:
-                        df = pd.DataFrame(odds_data)
-                        st.dataframe(df,
+                        st.dataframe(odds_data,
                                      use_container_width=True,
                                      hide_index=True)
 
@@ -1282,12 +1540,6 @@ def page_detail():
     st.divider()
     st.subheader("🎯 Market Prediction vs Actual Result")
 
-    # Check if game has finished by looking at close_dt
-    game_finished = False
-    if close_dt:
-        now = datetime.now(timezone.utc)
-        game_finished = now > close_dt
-
     if game_finished and bid_val is not None:
         st.info(
             "**Compare predictions to reality:** "
@@ -1296,25 +1548,14 @@ def page_detail():
 
         # Try to fetch ESPN game result
         with st.spinner("Fetching game result from ESPN..."):
-            away_team_name = ev.get("away_team", "")
-            home_team_name = ev.get("home_team", "")
-
-            # Determine which team this market is for
             # The label contains team name and either "— Yes" or "— No"
-            labeled_team = None
             is_yes_contract = "— Yes" in label
             is_no_contract = "— No" in label
 
-            if away_team_name.lower() in label.lower():
-                labeled_team = "away"
-            elif home_team_name.lower() in label.lower():
-                labeled_team = "home"
-
-            if labeled_team and close_dt:
-                game_result = espn.find_game_by_teams_and_date(
-                    away_team=away_team_name,
-                    home_team=home_team_name,
-                    game_date=close_dt)
+            if result_future is not None:
+                espn = get_espn(current_sport)
+                game_result = _collect(result_future, None,
+                                       "Error fetching ESPN game result")
 
                 if game_result:
                     # For No contracts, the bet is on the OPPONENT of the labeled team
@@ -1344,49 +1585,53 @@ def page_detail():
                     if comparison.get('status') == 'incomplete':
                         st.warning(comparison.get('message'))
                     else:
+                        # Unpack the comparison once for the widgets below
+                        kalshi_pct = comparison.get('kalshi_percentage')
+                        team_name = comparison.get('team_name')
+                        bet_won = comparison.get('bet_won')
+                        final_score = comparison.get('final_score') or {}
+                        away_score = final_score.get('away')
+                        home_score = final_score.get('home')
+
                         # Display comparison results
                         col1, col2 = st.columns(2)
 
                         with col1:
                             # Show appropriate metric based on contract type
-                            if comparison.get('contract_type') == 'No':
+                            if is_no_contract:
                                 # For No contracts, we're showing the opponent's win chance
                                 # Label shows team X with No contract at Y%
                                 # This means market gives opponent (100-Y)% chance to win
-                                labeled_team_name = away_team_name if comparison.get(
-                                    'labeled_team'
-                                ) == 'away' else home_team_name
-                                opponent_name = comparison.get('team_name')
-                                implied_labeled_team_win = comparison.get(
-                                    'implied_win_probability', 0)
+                                labeled_team_name = (away_team_name
+                                                     if labeled_team == 'away'
+                                                     else home_team_name)
 
                                 st.metric(
                                     "Market Prediction",
-                                    comparison.get('kalshi_percentage'),
+                                    kalshi_pct,
                                     help=
-                                    f"No contract on {labeled_team_name} at {pct(bid_val)} implies {opponent_name} has {comparison.get('kalshi_percentage')} chance to win"
+                                    f"No contract on {labeled_team_name} at {pct(bid_val)} implies {team_name} has {kalshi_pct} chance to win"
                                 )
                             else:
                                 st.metric(
                                     "Market Prediction",
-                                    comparison.get('kalshi_percentage'),
+                                    kalshi_pct,
                                     help=
-                                    f"Market was {comparison.get('confidence_level')} that {comparison.get('team_name')} would win"
+                                    f"Market was {comparison.get('confidence_level')} that {team_name} would win"
                                 )
 
                         with col2:
-                            result_emoji = "✅" if comparison.get(
-                                'bet_won') else "❌"
+                            result_emoji = "✅" if bet_won else "❌"
                             st.metric(
                                 "Actual Result",
-                                f"{result_emoji} {'Won' if comparison.get('bet_won') else 'Lost'}",
+                                f"{result_emoji} {'Won' if bet_won else 'Lost'}",
                                 help=
-                                f"Final score: {comparison.get('final_score', {}).get('away')} - {comparison.get('final_score', {}).get('home')}"
+                                f"Final score: {away_score} - {home_score}"
                             )
 
                         # Show analysis message
                         message = comparison.get('message', '')
-                        if comparison.get('bet_won'):
+                        if bet_won:
                             st.success(message)
                         else:
                             if comparison.get('kalshi_probability', 0) >= 0.6:
@@ -1407,163 +1652,15 @@ def page_detail():
     st.divider()
     st.subheader("📈 Historical Price Movement")
 
-    ticker = w.get("ticker")
-    if ticker:
-        st.info(
-            "**Understanding price history:** "
-            "This chart shows how the market's implied probability has changed over time. "
-            "Rising prices indicate growing confidence in the outcome, while falling prices suggest decreasing confidence. "
-            "Watch for trends and sudden movements that might indicate new information entering the market."
-        )
-
-        import plotly.graph_objects as go
-
-        # Fetch candlestick data
-        candlesticks = kalshi.get_market_candlesticks(
-            series_ticker=kalshi.series_ticker,
-            ticker=ticker,
-            period_interval=60  # 1-hour candles
-        )
-
-        if candlesticks and len(candlesticks) > 0:
-            # Filter out candlesticks with None close prices
-            valid_candles = [
-                c for c in candlesticks if c.get("close") is not None
-            ]
-
-            if valid_candles:
-                timestamps = [c["timestamp"] for c in valid_candles]
-                closes = [c["close"] for c in valid_candles]
-                volumes = [c.get("volume", 0) for c in valid_candles]
-            else:
-                # No valid data
-                timestamps, closes, volumes = [], [], []
-
-            # Calculate trend
-            if len(closes
-                   ) >= 2 and closes[0] is not None and closes[-1] is not None:
-                price_change = closes[-1] - closes[0]
-                pct_change = (price_change / closes[0] *
-                              100) if closes[0] > 0 else 0
-
-                if abs(pct_change) > 5:
-                    trend_emoji = "📈" if pct_change > 0 else "📉"
-                    trend_text = f"{trend_emoji} **Market trend:** {'Rising' if pct_change > 0 else 'Falling'} ({pct_change:+.1f}% over the period shown)"
-                else:
-                    trend_text = "➡️ **Market trend:** Stable (minimal movement)"
-
-                st.caption(trend_text)
-
-            # Create price chart only if we have valid data
-            if len(closes) > 0:
-                fig = go.Figure()
-
-                fig.add_trace(
-                    go.Scatter(
-                        x=timestamps,
-                        y=closes,
-                        mode='lines',
-                        name='Close Price',
-                        line=dict(color='#6366f1', width=3),
-                        hovertemplate=
-                        '<b>Time:</b> %{x}<br><b>Price:</b> $%{y:.2f}<extra></extra>'
-                    ))
-
-                fig.update_layout(title="Price Over Time (Hourly)",
-                                  xaxis_title="Time",
-                                  yaxis_title="Price (Probability)",
-                                  yaxis=dict(tickformat='.0%', range=[0, 1]),
-                                  hovermode='x unified',
-                                  height=400,
-                                  template='plotly_dark',
-                                  paper_bgcolor='#1e293b',
-                                  plot_bgcolor='#1e293b',
-                                  font=dict(color='#f1f5f9'))
-
-                st.plotly_chart(fig, use_container_width=True)
-
-                # Volume chart
-                if len(volumes) > 0 and max(volumes) > 0:
-                    fig_vol = go.Figure()
-                    fig_vol.add_trace(
-                        go.Bar(
-                            x=timestamps,
-                            y=volumes,
-                            name='Volume',
-                            marker_color='#10b981',
-                            hovertemplate=
-                            '<b>Time:</b> %{x}<br><b>Volume:</b> %{y}<extra></extra>'
-                        ))
-
-                    fig_vol.update_layout(title="Trading Volume Over Time",
-                                          xaxis_title="Time",
-                                          yaxis_title="Volume",
-                                          height=300,
-                                          template='plotly_dark',
-                                          paper_bgcolor='#1e293b',
-                                          plot_bgcolor='#1e293b',
-                                          font=dict(color='#f1f5f9'))
-
-                    with st.expander("📊 View Volume History"):
-                        st.caption(
-                            "**Volume spikes** can indicate important news or events affecting trader sentiment."
-                        )
-                        st.plotly_chart(fig_vol, use_container_width=True)
-            else:
-                st.info(
-                    "Historical price data contains no valid close prices. This can happen for newly created markets."
-                )
-        else:
-            st.info(
-                "Historical price data not yet available for this market. Check back after some trading activity."
-            )
+    render_price_history(
+        current_sport, ticker,
+        _collect(series_future, None, "Error fetching price history")
+        if series_future else None)
 
     # Order Book (Collapsed for mobile)
     st.divider()
 
-    with st.expander("📖 Current Order Book", expanded=False):
-        if ticker:
-            st.info(
-                "The order book shows pending buy/sell orders. "
-                "'Yes' orders bet the outcome happens; 'No' orders bet it doesn't."
-            )
-
-            orderbook = kalshi.get_market_orderbook(ticker)
-
-            if orderbook:
-                col_yes, col_no = st.columns(2)
-
-                with col_yes:
-                    st.markdown("**YES Orders**")
-                    yes_orders = orderbook.get("yes", [])
-                    if yes_orders:
-                        yes_df = pd.DataFrame(yes_orders[:10])  # Top 10
-                        if not yes_df.empty and "price" in yes_df.columns and "size" in yes_df.columns:
-                            yes_display = yes_df[["price", "size"]].copy()
-                            yes_display.columns = ["Price", "Size"]
-                            st.dataframe(yes_display,
-                                         hide_index=True,
-                                         use_container_width=True)
-                    else:
-                        st.caption("No YES orders")
-
-                with col_no:
-                    st.markdown("**NO Orders**")
-                    no_orders = orderbook.get("no", [])
-                    if no_orders:
-                        no_df = pd.DataFrame(no_orders[:10])  # Top 10
-                        if not no_df.empty and "price" in no_df.columns and "size" in no_df.columns:
-                            no_display = no_df[["price", "size"]].copy()
-                            no_display.columns = ["Price", "Size"]
-                            st.dataframe(no_display,
-                                         hide_index=True,
-                                         use_container_width=True)
-                    else:
-                        st.caption("No NO orders")
-            else:
-                st.info("Order book data not available.")
-        else:
-            st.info("No ticker available for order book.")
+    render_orderbook(current_sport, ticker)
 
     st.divider()
 
@@ -1572,51 +1669,16 @@ def page_detail():
             "Complete list of all betting contracts for this game, including player props and other markets."
         )
 
-        df = pd.DataFrame(ev["all_contracts"])
-        keep = [
-            c for c in [
-                "ticker", "title", "subtitle", "yes_bid", "yes_ask",
-                "open_interest", "volume_24h", "close_dt", "market_type"
-            ] if c in df.columns
-        ]
-        if "close_dt" in df.columns:
-            df_sorted = df.sort_values(by="close_dt",
-                                       ascending=True,
-                                       na_position="last",
-                                       ignore_index=True)
-        else:
-            df_sorted = df.copy()
-        st.dataframe(df_sorted[keep], use_container_width=True)
+        contracts = ev["all_contracts_sorted"]
+        present = set().union(*contracts)
+        keep = [c for c in _CONTRACT_COLUMNS if c in present]
+        df = pd.DataFrame.from_records(contracts, columns=keep)
+        st.dataframe(df, use_container_width=True)
 
     # ---------- Context generation ----------
     st.divider()
     st.subheader("Generate Game Context (ESPN + GPT via FastAPI)")
-    auto_game_id = find_game_id(ev["away_team"], ev["home_team"],
-                                ev["close_dt"])
-    with st.expander("Game mapping details"):
-        st.write({
-            "away_team": ev["away_team"],
-            "home_team": ev["home_team"],
-            "kalshi_close_dt": str(ev["close_dt"]),
-            "auto_resolved_game_id": auto_game_id,
-            "context_url": CONTEXT_URL,
-        })
-
-    game_id = st.text_input("ESPN game_id", value=auto_game_id or "")
-    colL, colR = st.columns([1, 5])
-    with colL:
-        run = st.button("Generate Context")
-
-    if run and game_id:
-        data = call_context(game_id, include_llm=True)
-        if data:
-            if data.get("llm", {}).get("summary_md"):
-                st.markdown("### Analyst Brief")
-                st.markdown(data["llm"]["summary_md"])
-            else:
-                st.info("LLM summary not available; showing facts only.")
-            st.markdown("### Facts (compact)")
-            st.json(data.get("facts", {}))
+    render_context_section(ev)
 
     current_sport = qp_get("sport", "all")
     st.link_button("⬅️ Back to list", f"?page=list&sport={current_sport}")
@@ -1626,7 +1688,10 @@ def main():
     init_state()
     page = qp_get("page", "list")
     if page == "detail":
-        page_detail()
+        # Leaving the block joins the detail fetches, including any a
+        # st.stop(), rerun or error skipped, so no worker outlives this run
+        with _thread_pool(max_workers=5) as pool:
+            page_detail(pool)
     else:
         page_list()
 
@@ -1,5 +1,6 @@
 import os
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, ForeignKey
+from contextlib import contextmanager
+from sqlalchemy import create_engine, text, Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime, timezone
@@ -52,6 +53,9 @@ class Game(Base):
     game_date = Column(DateTime, nullable=True)
     close_date = Column(DateTime, nullable=True)
     
+    # ESPN events[].id resolved for this game (saves re-scanning scoreboards)
+    espn_event_id = Column(String, nullable=True, index=True)
+    
     # Game outcome (filled after game completes)
     is_completed = Column(Boolean, default=False)
     winner = Column(String, nullable=True)
@@ -61,6 +65,11 @@ class Game(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     
     predictions = relationship("Prediction", back_populates="game")
+    
+    __table_args__ = (
+        # Outcome backfill scans for unfinished games by date
+        Index("ix_games_incomplete", "is_completed", "game_date"),
+    )
 
 
 class Prediction(Base):
@@ -86,17 +95,41 @@ class Prediction(Base):
     
     user_session = relationship("UserSession", back_populates="predictions")
     game = relationship("Game", back_populates="predictions")
+    
+    __table_args__ = (
+        # A session's prediction for a game (one row per pair)
+        Index("ix_predictions_session_game", "session_id", "game_id"),
+        # Community consensus and outcome settling by game
+        Index("ix_predictions_game_correct", "game_id", "is_correct"),
+    )
 
 
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    # create_all doesn't alter existing tables; add columns and indexes
+    # introduced later
+    with engine.begin() as conn:
+        conn.execute(text(
+            "ALTER TABLE games ADD COLUMN IF NOT EXISTS espn_event_id VARCHAR"))
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
 
 
+@contextmanager
 def get_db():
-    """Get database session"""
+    """
+    Database session scoped to a with-block.
+
+    Rolls back on error and always closes, returning the connection to the
+    pool. Callers commit explicitly.
+    """
     db = SessionLocal()
     try:
-        return db
+        yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
-        pass  # Don't close here, let caller manage
+        db.close()
@@ -2,16 +2,29 @@
 from __future__ import annotations
 
 import datetime as dt
+import functools
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-import requests
+from http_session import build_session
 
 ESPN_SCOREBOARD = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
 
+# Scoreboards are re-fetched after this long, so games whose opponents or
+# kickoff were still TBD can be found once the schedule settles
+_SCOREBOARD_TTL = 10 * 60
+_NORM_RE = re.compile(r"[^a-z]")
 
+# Keep-alive session shared by every lookup (and the parallel date fetches)
+_SESSION = build_session({"Accept": "application/json"})
+
+
+@functools.lru_cache(maxsize=1024)
 def _norm(s: str) -> str:
-    return re.sub(r"[^a-z]", "", (s or "").lower())
+    # Memoized: the same franchise names recur across dates and lookups
+    return _NORM_RE.sub("", (s or "").lower())
 
 
 def _eq(a: str, b: str) -> bool:
@@ -19,7 +32,15 @@ def _eq(a: str, b: str) -> bool:
 
 
 def _fetch_scoreboard(date_yyyymmdd: str) -> dict:
-    r = requests.get(ESPN_SCOREBOARD,
+    return _fetch_scoreboard_cached(date_yyyymmdd,
+                                    int(time.monotonic() // _SCOREBOARD_TTL))
+
+
+@functools.lru_cache(maxsize=256)
+def _fetch_scoreboard_cached(date_yyyymmdd: str, ttl_bucket: int) -> dict:
+    # ttl_bucket only expires the entry: it changes every _SCOREBOARD_TTL
+    # seconds. Failed fetches raise and so are never cached
+    r = _SESSION.get(ESPN_SCOREBOARD,
                      params={"dates": date_yyyymmdd},
                      timeout=20)
     r.raise_for_status()
@@ -37,21 +58,28 @@ def find_game_id(away: str, home: str,
     else:
         base = dt.date.today()
 
-    candidates = [base + dt.timedelta(days=i) for i in (-2, -1, 0, 1, 2)]
+    # Nearest dates first: most games are on the close date itself
+    candidates = [base + dt.timedelta(days=i) for i in (0, -1, 1, -2, 2)]
     a_norm = _norm(away)
     h_norm = _norm(home)
 
-    for d in candidates:
-        sb = _fetch_scoreboard(d.strftime("%Y%m%d"))
+    # Fetch every date at once, but scan in candidate order and return on the
+    # first match without waiting for the farther dates
+    ex = ThreadPoolExecutor(max_workers=len(candidates))
+    futures = [ex.submit(_fetch_scoreboard, d.strftime("%Y%m%d"))
+               for d in candidates]
+    ex.shutdown(wait=False)
+
+    for fut in futures:
+        sb = fut.result()
         for ev in sb.get("events", []):
             comp = (ev.get("competitions") or [{}])[0]
             comps = comp.get("competitors", []) or []
             if len(comps) < 2:
                 continue
-            t_away = next((c for c in comps if c.get("homeAway") == "away"),
-                          comps[0])
-            t_home = next((c for c in comps if c.get("homeAway") == "home"),
-                          comps[-1])
+            by_side = {c.get("homeAway"): c for c in comps}
+            t_away = by_side.get("away", comps[0])
+            t_home = by_side.get("home", comps[-1])
             name_away = t_away.get("team", {}).get("displayName", "")
             name_home = t_home.get("team", {}).get("displayName", "")
             if _norm(name_away) == a_norm and _norm(name_home) == h_norm:
@@ -5,17 +5,112 @@ Supports NFL, NBA, NHL, and Soccer.
 """
 
 import requests
-from datetime import datetime, timezone
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, List
 import logging
+from http_session import build_session
 from sport_config import get_sport_config, get_teams_for_sport
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to requests' decoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Shared default for missing nested objects; read-only, never mutate it
+_EMPTY: Dict = {}
+
+
+def _parse_json(response: requests.Response):
+    """Decode a JSON response body, with orjson when it's installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass  # let requests raise its own (RequestException) error
+    return response.json()
+
+
+def _sift4(s1: str, s2: str, max_offset: int = 5) -> int:
+    """
+    Approximate edit distance between s1 and s2 (Sift4, common variant).
+
+    Walks both strings with two cursors, looking up to max_offset characters
+    ahead to resync after a mismatch, so it is roughly linear in the string
+    length rather than O(n*m) like Levenshtein.
+    """
+    l1, l2 = len(s1), len(s2)
+    if not l1:
+        return l2
+    if not l2:
+        return l1
+
+    c1 = c2 = 0
+    lcss = local_cs = trans = 0
+    offsets = []  # [c1, c2, is_transposition] of recent matches
+    while c1 < l1 and c2 < l2:
+        if s1[c1] == s2[c2]:
+            local_cs += 1
+            is_trans = False
+            i = 0
+            while i < len(offsets):
+                ofs = offsets[i]
+                if c1 <= ofs[0] or c2 <= ofs[1]:
+                    is_trans = abs(c2 - c1) >= abs(ofs[1] - ofs[0])
+                    if is_trans:
+                        trans += 1
+                    elif not ofs[2]:
+                        ofs[2] = True
+                        trans += 1
+                    break
+                if c1 > ofs[1] and c2 > ofs[0]:
+                    del offsets[i]
+                else:
+                    i += 1
+            offsets.append([c1, c2, is_trans])
+        else:
+            lcss += local_cs
+            local_cs = 0
+            if c1 != c2:
+                c1 = c2 = min(c1, c2)
+            for i in range(max_offset):
+                if c1 + i >= l1 and c2 + i >= l2:
+                    break
+                if c1 + i < l1 and s1[c1 + i] == s2[c2]:
+                    c1 += i - 1
+                    c2 -= 1
+                    break
+                if c2 + i < l2 and s1[c1] == s2[c2 + i]:
+                    c1 -= 1
+                    c2 += i - 1
+                    break
+        c1 += 1
+        c2 += 1
+        if c1 >= l1 or c2 >= l2:
+            lcss += local_cs
+            local_cs = 0
+            c1 = c2 = min(c1, c2)
+    lcss += local_cs
+    return max(l1, l2) - lcss + trans
+
 
 class ESPNService:
     """Service for fetching multi-sport game data from ESPN API."""
     
+    # Class-level response cache shared across instances and threads:
+    # key -> (expires_at, data). TTL is long once every game in the
+    # response is final, short while anything can still change. Expired
+    # entries are dropped, and the oldest go once _cache_max is reached.
+    _response_cache: Dict[tuple, tuple] = {}
+    _cache_lock = threading.Lock()
+    _live_ttl = 60
+    _final_ttl = 24 * 60 * 60
+    _cache_max = 512
+    
     def __init__(self, sport: str = "nfl"):
         self.sport = sport.lower()
         self.sport_config = get_sport_config(self.sport)
@@ -27,13 +122,47 @@ class ESPNService:
         self.BASE_URL = f"http://site.api.espn.com/apis/site/v2/sports/{espn_sport}/{espn_league}"
         self.CORE_API_URL = f"https://sports.core.api.espn.com/v2/sports/{espn_sport}/leagues/{espn_league}"
         
+        # Lowercased canonical team name -> every accepted name for that team
+        # (canonical, abbreviation and variations from sport_config)
+        self._team_aliases: Dict[str, frozenset] = {
+            canonical.lower(): frozenset(
+                name.lower() for name in (canonical, team_data["abbr"], *team_data["variations"]))
+            for canonical, team_data in get_teams_for_sport(self.sport).items()
+        }
+        
         # Initialize HTTP session
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = build_session({
             'Accept': 'application/json',
             'User-Agent': 'Mozilla/5.0 (compatible; OddSense/1.0)'
         })
     
+    def _cache_get(self, key: tuple) -> Optional[Dict]:
+        """Return a cached response if it hasn't expired."""
+        cache = ESPNService._response_cache
+        with ESPNService._cache_lock:
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() < entry[0]:
+                return entry[1]
+            del cache[key]
+        return None
+    
+    def _cache_put(self, key: tuple, data: Dict, final: bool) -> None:
+        """Cache a response, keeping final results for a day and live ones briefly."""
+        now = time.monotonic()
+        ttl = ESPNService._final_ttl if final else ESPNService._live_ttl
+        cache = ESPNService._response_cache
+        with ESPNService._cache_lock:
+            cache.pop(key, None)
+            if len(cache) >= ESPNService._cache_max:
+                for stale in [k for k, (expires_at, _) in cache.items() if expires_at <= now]:
+                    del cache[stale]
+                # Still full: evict in insertion order (oldest first)
+                while len(cache) >= ESPNService._cache_max:
+                    del cache[next(iter(cache))]
+            cache[key] = (now + ttl, data)
+    
     def get_scoreboard(self, date: Optional[str] = None, week: Optional[int] = None, 
                        season: Optional[int] = None, seasontype: int = 2) -> Optional[Dict]:
         """
@@ -51,6 +180,12 @@ class ESPNService:
         url = f"{self.BASE_URL}/scoreboard"
         params = {}
         
+        # Date scoreboards are shared by every game lookup around that date
+        cache_key = ('scoreboard', self.sport, date, week, season, seasontype)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         if date:
             params['dates'] = date
         elif week and season:
@@ -62,9 +197,14 @@ class ESPNService:
             logger.info(f"Fetching ESPN scoreboard: {url} with params {params}")
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = _parse_json(response)
             
             logger.info(f"Successfully fetched scoreboard with {len(data.get('events', []))} games")
+            events = data.get('events', [])
+            final = bool(events) and all(
+                event.get('status', {}).get('type', {}).get('state') == 'post'
+                for event in events)
+            self._cache_put(cache_key, data, final)
             return data
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching ESPN scoreboard: {e}")
@@ -83,13 +223,21 @@ class ESPNService:
         url = f"{self.BASE_URL}/summary"
         params = {'event': game_id}
         
+        cache_key = ('summary', self.sport, game_id)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             logger.info(f"Fetching ESPN game summary for game_id={game_id}")
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = _parse_json(response)
             
             logger.info(f"Successfully fetched game summary for {game_id}")
+            competitions = data.get('header', {}).get('competitions') or [{}]
+            final = bool(competitions[0].get('status', {}).get('type', {}).get('completed'))
+            self._cache_put(cache_key, data, final)
             return data
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching game summary for {game_id}: {e}")
@@ -214,42 +362,60 @@ class ESPNService:
         # Format date for ESPN API (YYYYMMDD)
         date_str = game_date.strftime('%Y%m%d')
         
-        # Try the exact date and neighboring dates
-        for day_offset in [0, -1, 1, -2, 2]:
-            from datetime import timedelta
-            check_date = game_date + timedelta(days=day_offset)
-            check_date_str = check_date.strftime('%Y%m%d')
+        # Most games are on the exact date: check it alone first
+        event = self._find_event_in_scoreboard(self.get_scoreboard(date=date_str),
+                                               away_team, home_team)
+        if event:
+            logger.info(f"Found matching game: {away_team} @ {home_team} on {date_str}")
+            return self._extract_game_result(event)
+        
+        # Then the neighboring dates. The scoreboards are independent requests,
+        # so fetch them all at once and scan them in offset order, returning on
+        # the first match without waiting for the rest
+        check_dates = [(game_date + timedelta(days=day_offset)).strftime('%Y%m%d')
+                       for day_offset in [-1, 1, -2, 2]]
+        executor = ThreadPoolExecutor(max_workers=len(check_dates))
+        futures = [executor.submit(self.get_scoreboard, date=check_date_str)
+                   for check_date_str in check_dates]
+        executor.shutdown(wait=False)
+        
+        for check_date_str, future in zip(check_dates, futures):
+            event = self._find_event_in_scoreboard(future.result(), away_team, home_team)
+            if event:
+                logger.info(f"Found matching game: {away_team} @ {home_team} on {check_date_str}")
+                return self._extract_game_result(event)
+        
+        logger.warning(f"No game found for {away_team} @ {home_team} near {date_str}")
+        return None
+    
+    def _find_event_in_scoreboard(self, scoreboard: Optional[Dict], away_team: str,
+                                  home_team: str) -> Optional[Dict]:
+        """Return the scoreboard event matching the given away/home teams, if any."""
+        if not scoreboard or 'events' not in scoreboard:
+            return None
+        
+        for event in scoreboard['events']:
+            if not event.get('competitions'):
+                continue
+            
+            competition = event['competitions'][0]
+            competitors = competition.get('competitors', [])
             
-            scoreboard = self.get_scoreboard(date=check_date_str)
-            if not scoreboard or 'events' not in scoreboard:
+            if len(competitors) != 2:
                 continue
             
-            # Search for matching game
-            for event in scoreboard['events']:
-                if not event.get('competitions'):
-                    continue
-                
-                competition = event['competitions'][0]
-                competitors = competition.get('competitors', [])
-                
-                if len(competitors) != 2:
-                    continue
-                
-                # Extract team names
-                teams = {}
-                for comp in competitors:
-                    home_away = comp.get('homeAway', '')
-                    team_name = comp.get('team', {}).get('displayName', '')
-                    teams[home_away] = team_name
-                
-                # Check if teams match
-                if (self._team_names_match(teams.get('away', ''), away_team) and
-                    self._team_names_match(teams.get('home', ''), home_team)):
-                    
-                    logger.info(f"Found matching game: {away_team} @ {home_team} on {check_date_str}")
-                    return self._extract_game_result(event)
+            # Extract team names
+            teams = {}
+            for comp in competitors:
+                home_away = comp.get('homeAway', '')
+                team_name = comp.get('team', {}).get('displayName', '')
+                teams[home_away] = team_name
+            
+            # Check if teams match
+            if (self._team_names_match(teams.get('away', ''), away_team) and
+                self._team_names_match(teams.get('home', ''), home_team)):
+                return event
         
-        logger.warning(f"No game found for {away_team} @ {home_team} near {date_str}")
         return None
     
     def _team_names_match(self, espn_name: str, kalshi_name: str) -> bool:
@@ -263,6 +429,11 @@ class ESPNService:
         espn_lower = espn_name.lower()
         kalshi_lower = kalshi_name.lower()
         
+        # Fast path: known aliases resolve by set lookup
+        if kalshi_lower in self._team_aliases.get(espn_lower, ()):
+            return True
+        
+        # Otherwise fall back to loose matching
         # Direct match
         if espn_lower == kalshi_lower:
             return True
@@ -284,7 +455,17 @@ class ESPNService:
             if espn_parts[-1] == kalshi_parts[-1]:
                 return True
         
-        return False
+        # Tolerate one misspelled word, e.g. 'Borusia Dortmund'. Only a
+        # single edit in a word of 6+ characters, so short names that are one
+        # letter apart ('Jets'/'Nets', 'KC'/'CP') never match
+        if len(espn_parts) != len(kalshi_parts):
+            return False
+        diffs = [(a, b) for a, b in zip(espn_parts, kalshi_parts) if a != b]
+        if len(diffs) != 1:
+            return False
+        espn_word, kalshi_word = diffs[0]
+        return (min(len(espn_word), len(kalshi_word)) >= 6 and
+                _sift4(espn_word, kalshi_word) <= 1)
     
     def _extract_game_result(self, event: Dict) -> Dict:
         """
@@ -293,55 +474,56 @@ class ESPNService:
         Returns:
             Dict with game_id, status, scores, winner, etc.
         """
-        competition = event.get('competitions', [{}])[0]
-        competitors = competition.get('competitors', [])
+        ev_get = event.get
+        competition = ev_get('competitions', [{}])[0]
         
         # Extract team data
         home_team = None
         away_team = None
         
-        for comp in competitors:
+        for comp in competition.get('competitors') or ():
+            comp_get = comp.get
+            team = comp_get('team') or _EMPTY
+            score = comp_get('score')
             team_data = {
-                'id': comp.get('id'),
-                'name': comp.get('team', {}).get('displayName', ''),
-                'abbreviation': comp.get('team', {}).get('abbreviation', ''),
-                'score': int(comp.get('score', 0)) if comp.get('score') else None,
-                'winner': comp.get('winner', False)
+                'id': comp_get('id'),
+                'name': team.get('displayName', ''),
+                'abbreviation': team.get('abbreviation', ''),
+                'score': int(score) if score else None,
+                'winner': comp_get('winner', False)
             }
             
-            if comp.get('homeAway') == 'home':
+            if comp_get('homeAway') == 'home':
                 home_team = team_data
             else:
                 away_team = team_data
         
         # Game status
-        status = event.get('status', {})
-        status_type = status.get('type', {})
-        
-        result = {
-            'game_id': event.get('id'),
-            'name': event.get('name'),
-            'short_name': event.get('shortName'),
-            'date': event.get('date'),
+        status_type = (ev_get('status') or _EMPTY).get('type') or _EMPTY
+        completed = status_type.get('completed', False)
+        
+        # Determine winner
+        winner = None
+        if completed and home_team and away_team:
+            if home_team['winner']:
+                winner = 'home'
+            elif away_team['winner']:
+                winner = 'away'
+        
+        return {
+            'game_id': ev_get('id'),
+            'name': ev_get('name'),
+            'short_name': ev_get('shortName'),
+            'date': ev_get('date'),
             'status': {
-                'completed': status_type.get('completed', False),
+                'completed': completed,
                 'description': status_type.get('description', ''),
                 'state': status_type.get('state', '')
             },
             'home_team': home_team,
             'away_team': away_team,
-            'winner': None
+            'winner': winner
         }
-        
-        # Determine winner
-        if result['status']['completed']:
-            if home_team and away_team:
-                if home_team.get('winner'):
-                    result['winner'] = 'home'
-                elif away_team.get('winner'):
-                    result['winner'] = 'away'
-        
-        return result
     
     def compare_to_kalshi_odds(self, game_result: Dict, kalshi_probability: float, 
                                bet_on_team: str) -> Dict:
@@ -0,0 +1,37 @@
+"""
+Shared HTTP session factory for the external API clients.
+"""
+
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def build_session(headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    Create a requests.Session with keep-alive connection pooling.
+
+    Clients are long-lived (cached per sport by the app), so connections are
+    reused across calls instead of paying a new TCP/TLS handshake each time.
+    GETs are retried twice with a short backoff on connection errors and
+    429/5xx responses; the final response is still returned to the caller.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
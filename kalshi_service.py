@@ -4,7 +4,7 @@ from datetime import datetime
 from difflib import get_close_matches
 from typing import Dict, List, Optional, Tuple
 
-import requests
+from http_session import build_session
 from sport_config import get_sport_config, get_teams_for_sport
 
 
@@ -38,8 +38,7 @@ class KalshiService:
         self.TEAM_ABBRS = set(self.TEAM_MAP.keys())
         self.TEAM_NAMES = list(self.TEAM_MAP.values())
         
-        self.session = requests.Session()
-        self.session.headers.update({"Accept": "application/json"})
+        self.session = build_session({"Accept": "application/json"})
 
     # ---------------- HTTP ----------------
 
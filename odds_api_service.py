@@ -4,6 +4,7 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime, timezone, timedelta
 from difflib import SequenceMatcher
+from http_session import build_session
 from sport_config import get_sport_config, build_team_variations_map
 
 logger = logging.getLogger(__name__)
@@ -29,6 +30,9 @@ class OddsAPIService:
         odds_api_key = self.sport_config.get("odds_api_key", "americanfootball_nfl")
         self.base_url = f"https://api.the-odds-api.com/v4/sports/{odds_api_key}/odds"
         
+        # Pooled HTTP session, reused for every odds refresh
+        self.session = build_session({"Accept": "application/json"})
+        
         # Get centralized team variations map for normalization
         self.team_variations = build_team_variations_map(self.sport)
         
@@ -91,7 +95,7 @@ class OddsAPIService:
             }
             
             logger.info(f"Fetching {self.sport.upper()} odds from The Odds API")
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = self.session.get(self.base_url, params=params, timeout=10)
             response.raise_for_status()
             
             odds_data = response.json()
@@ -194,64 +198,60 @@ class OddsAPIService:
         
         return consensus
     
-    def get_best_odds(self, game: Dict, team_name: str) -> Optional[Dict]:
+    def index_by_team(self, game: Dict) -> Dict[str, List[Dict]]:
         """
-        Find the best available odds for a specific team.
-        For favorites (negative odds), best = least negative (e.g., -120 better than -150)
-        For underdogs (positive odds), best = most positive (e.g., +200 better than +150)
+        Group a game's h2h odds by team in a single pass over the bookmakers.
+        Returns {team_name: [{bookmaker, odds, probability}, ...]}, which
+        get_best_odds and get_all_bookmaker_odds accept in place of the game.
         """
+        index: Dict[str, List[Dict]] = {}
         if not game or "bookmakers" not in game:
-            return None
-        
-        best_odds = None
-        best_bookmaker = None
+            return index
         
         for bookmaker in game["bookmakers"]:
             for market in bookmaker.get("markets", []):
                 if market.get("key") == "h2h":
                     for outcome in market.get("outcomes", []):
-                        if outcome["name"] == team_name:
-                            odds = outcome["price"]
-                            
-                            if best_odds is None:
-                                best_odds = odds
-                                best_bookmaker = bookmaker["title"]
-                            else:
-                                # For favorites (negative), less negative is better
-                                # For underdogs (positive), more positive is better
-                                if (odds < 0 and odds > best_odds) or (odds > 0 and odds > best_odds):
-                                    best_odds = odds
-                                    best_bookmaker = bookmaker["title"]
+                        odds = outcome["price"]
+                        index.setdefault(outcome["name"], []).append({
+                            "bookmaker": bookmaker["title"],
+                            "odds": odds,
+                            "probability": self.american_to_probability(odds)
+                        })
         
-        if best_odds is not None:
-            return {
-                "odds": best_odds,
-                "bookmaker": best_bookmaker,
-                "probability": self.american_to_probability(best_odds)
-            }
+        return index
+    
+    def _team_odds(self, game: Dict, team_name: str) -> List[Dict]:
+        """Look up a team's odds from a raw game or a prebuilt team index."""
+        if not game:
+            return []
+        index = self.index_by_team(game) if "bookmakers" in game else game
+        return index.get(team_name, [])
+    
+    def get_best_odds(self, game: Dict, team_name: str) -> Optional[Dict]:
+        """
+        Find the best available odds for a specific team.
+        For favorites (negative odds), best = least negative (e.g., -120 better than -150)
+        For underdogs (positive odds), best = most positive (e.g., +200 better than +150)
+        Accepts the raw game or the result of index_by_team.
+        """
+        best = None
         
-        return None
+        for entry in self._team_odds(game, team_name):
+            odds = entry["odds"]
+            if best is None:
+                best = entry
+            # For favorites (negative), less negative is better
+            # For underdogs (positive), more positive is better
+            elif (odds < 0 and odds > best["odds"]) or (odds > 0 and odds > best["odds"]):
+                best = entry
+        
+        return dict(best) if best is not None else None
     
     def get_all_bookmaker_odds(self, game: Dict, team_name: str) -> List[Dict]:
         """
         Get odds from all bookmakers for a specific team.
         Returns a list of {bookmaker, odds, probability} dicts.
+        Accepts the raw game or the result of index_by_team.
         """
-        if not game or "bookmakers" not in game:
-            return []
-        
-        all_odds = []
-        
-        for bookmaker in game["bookmakers"]:
-            for market in bookmaker.get("markets", []):
-                if market.get("key") == "h2h":
-                    for outcome in market.get("outcomes", []):
-                        if outcome["name"] == team_name:
-                            odds = outcome["price"]
-                            all_odds.append({
-                                "bookmaker": bookmaker["title"],
-                                "odds": odds,
-                                "probability": self.american_to_probability(odds)
-                            })
-        
-        return all_odds
+        return list(self._team_odds(game, team_name))
@@ -13,8 +13,7 @@ class PredictionService:
     
     def get_or_create_session(self, session_id: str) -> UserSession:
         """Get existing user session or create new one"""
-        db = get_db()
-        try:
+        with get_db() as db:
             user_session = db.query(UserSession).filter(
                 UserSession.session_id == session_id
             ).first()
@@ -30,15 +29,12 @@ class PredictionService:
                 db.commit()
             
             return user_session
-        finally:
-            db.close()
     
     def get_or_create_game(self, event_ticker: str, sport: str, 
                            home_team: str, away_team: str,
                            game_date=None, close_date=None) -> Game:
         """Get existing game or create new one"""
-        db = get_db()
-        try:
+        with get_db() as db:
             game = db.query(Game).filter(
                 Game.event_ticker == event_ticker
             ).first()
@@ -57,8 +53,6 @@ class PredictionService:
                 db.refresh(game)
             
             return game
-        finally:
-            db.close()
     
     def save_prediction(self, session_id: str, event_ticker: str, sport: str,
                        home_team: str, away_team: str, predicted_winner: str,
@@ -66,8 +60,7 @@ class PredictionService:
                        sportsbook_consensus: float = None,
                        game_date=None, close_date=None) -> Prediction:
         """Save a user prediction"""
-        db = get_db()
-        try:
+        with get_db() as db:
             # Get user session within same DB session
             user_session = db.query(UserSession).filter(
                 UserSession.session_id == session_id
@@ -97,6 +90,9 @@ class PredictionService:
                 )
                 db.add(game)
                 db.flush()  # Get ID without committing
+            elif game.game_date is None and game_date is not None:
+                # Row created before any prediction (e.g. by save_espn_event_id)
+                game.game_date = game_date
             
             # Check if prediction already exists for this session + game
             existing = db.query(Prediction).filter(
@@ -128,13 +124,10 @@ class PredictionService:
             
             db.commit()
             return existing if existing else prediction
-        finally:
-            db.close()
     
     def get_user_prediction(self, session_id: str, event_ticker: str):
         """Get user's existing prediction for a game"""
-        db = get_db()
-        try:
+        with get_db() as db:
             user_session = db.query(UserSession).filter(
                 UserSession.session_id == session_id
             ).first()
@@ -155,13 +148,10 @@ class PredictionService:
             ).first()
             
             return prediction
-        finally:
-            db.close()
     
     def get_community_consensus(self, event_ticker: str):
         """Get community consensus for a game"""
-        db = get_db()
-        try:
+        with get_db() as db:
             game = db.query(Game).filter(
                 Game.event_ticker == event_ticker
             ).first()
@@ -197,8 +187,37 @@ class PredictionService:
                 "home_count": len(home_predictions),
                 "away_count": len(away_predictions)
             }
-        finally:
-            db.close()
+    
+    def get_espn_event_id(self, event_ticker: str):
+        """Get the stored ESPN event id for a game, if one was resolved"""
+        with get_db() as db:
+            return db.query(Game.espn_event_id).filter(
+                Game.event_ticker == event_ticker
+            ).scalar()
+    
+    def save_espn_event_id(self, event_ticker: str, sport: str,
+                           home_team: str, away_team: str,
+                           espn_event_id: str, game_date=None,
+                           close_date=None) -> None:
+        """Store the resolved ESPN event id on the game (creating it if needed)"""
+        with get_db() as db:
+            game = db.query(Game).filter(
+                Game.event_ticker == event_ticker
+            ).first()
+            
+            if not game:
+                game = Game(
+                    event_ticker=event_ticker,
+                    sport=sport,
+                    home_team=home_team,
+                    away_team=away_team,
+                    game_date=game_date,
+                    close_date=close_date
+                )
+                db.add(game)
+            
+            game.espn_event_id = espn_event_id
+            db.commit()
     
     def generate_session_id(self) -> str:
         """Generate a unique session ID"""
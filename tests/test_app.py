@@ -0,0 +1,279 @@
+"""
+Tests for the page helpers in app.py, plus headless AppTest runs of the
+pages with every external service stubbed out.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import app
+import espn_lookup
+from espn_service import ESPNService
+from gemini_service import GeminiService
+from kalshi_service import KalshiService
+from odds_api_service import OddsAPIService
+from prediction_service import PredictionService
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "app.py")
+
+EVENT_TICKER = "KXNFLGAME-25NOV30ATLIND"
+AWAY, HOME = "Atlanta Falcons", "Indianapolis Colts"
+
+
+@pytest.mark.parametrize("bid", [0.05, 0.25, 0.3, 0.4, 0.5, 0.6, 0.7, 0.75, 0.9])
+def test_summarize_card_odds_matches_single_event_helpers(bid):
+    ev = {"winner_primary": {"subject_team": "Colts", "yes_bid": bid}}
+    [(label, bid_val, prob_pct, quality)] = app.summarize_card_odds([ev])
+    assert label == "Colts — Yes"
+    assert bid_val == bid
+    assert prob_pct == app.pct(bid)
+    assert quality == app.get_odds_quality(bid)
+
+
+def test_summarize_card_odds_without_a_price():
+    events = [{"winner_primary": {"subject_team": "Colts"}},
+              {"winner_primary": {"subject_team": "Colts", "yes_bid": 0}},
+              {}]
+    rows = app.summarize_card_odds(events)
+    assert [r[2] for r in rows] == ["—", "—", "—"]
+    assert rows[0][3] == ("Unknown", "odds-neutral", "No data")
+    assert rows[2][0] == "Team — Yes"
+
+
+def test_summarize_card_odds_prefers_no_bid_over_missing_yes():
+    ev = {"winner_primary": {"subject_team": "Colts", "no_bid": 0.35}}
+    [(label, bid_val, prob_pct, _)] = app.summarize_card_odds([ev])
+    assert (label, bid_val, prob_pct) == ("Colts — No", 0.35, "35%")
+
+
+def test_classify_odds_quality_buckets_and_missing():
+    probs = np.array([0.1, 0.25, 0.2501, 0.4, 0.5, 0.6, 0.75, 0.76, np.nan])
+    buckets = app.classify_odds_quality(probs)
+    assert buckets.tolist() == [0, 1, 1, 2, 2, 3, 4, 4, -1]
+    # Same buckets as the single-value classifier
+    for prob, bucket in zip(probs[:-1], buckets[:-1]):
+        assert app.get_odds_quality(prob)[0] == app._QUALITY_BUCKETS[bucket][0]
+
+
+def test_get_odds_quality_missing_and_nan():
+    assert app.get_odds_quality(None) == ("Unknown", "odds-neutral", "No data")
+    assert app.get_odds_quality(float("nan")) == (
+        "Long Shot", "odds-excellent", "Upset potential at nan%")
+
+
+def _winner(ticker, yes_bid=None, last_price=None):
+    return {"ticker": ticker, "title": "Atlanta at Indianapolis Winner?",
+            "yes_bid": yes_bid, "last_price": last_price}
+
+
+def test_probs_by_team_code_assigns_each_side():
+    contracts = [_winner("KXNFLGAME-25NOV09ATLIND-IND", yes_bid=0.61),
+                 _winner("KXNFLGAME-25NOV09ATLIND-ATL", yes_bid=0.39)]
+    assert app._probs_by_team_code(
+        contracts, "KXNFLGAME-25NOV09ATLIND") == (0.39, 0.61)
+
+
+def test_probs_by_team_code_skips_ambiguous_and_unpriced_contracts():
+    contracts = [
+        _winner("KXNFLGAME-25NOV09-ATL-IND"),  # names both teams
+        _winner("KXNFLGAME-25NOV09-B-ATL-WIN"),  # no price yet
+        _winner("KXNFLGAME-25NOV09-C-ATL-WIN", last_price=0.42),
+    ]
+    assert app._probs_by_team_code(
+        contracts, "KXNFLGAME-25NOV09ATLIND") == (0.42, None)
+
+
+def test_probs_by_team_code_needs_two_codes_in_the_event_ticker():
+    contracts = [_winner("KXNFLGAME-25NOV09ATLIND-ATL", yes_bid=0.39)]
+    assert app._probs_by_team_code(contracts, "25NOV09") == (None, None)
+    assert app._probs_by_team_code(contracts, "") == (None, None)
+
+
+@pytest.mark.parametrize("hours, short, long_start", [
+    (72, "3d", "Market closes in **3 days**"),
+    (30, "30h", "Market closes in **1 days**"),
+    (5.5, "5h", "Market closes in **5 hours**"),
+    (-1, "Closed", "Market closed "),
+])
+def test_format_time_left(hours, short, long_start):
+    now = datetime(2025, 11, 9, 12, 0, tzinfo=timezone.utc)
+    close_dt = now + timedelta(hours=hours)
+    got_short, got_long, hours_left = app.format_time_left(close_dt, now)
+    assert got_short == short
+    assert got_long.startswith(long_start)
+    assert hours_left == pytest.approx(hours)
+
+
+def test_format_time_left_without_close_time():
+    now = datetime(2025, 11, 9, 12, 0, tzinfo=timezone.utc)
+    assert app.format_time_left(None, now) == (
+        "", "Close time not available", None)
+
+
+def test_canon_strips_punctuation_and_spacing():
+    assert app._canon("  St. Louis   Blues ") == "st louis blues"
+    assert app._canon("Colts — Yes") == "colts yes"
+
+
+def test_build_price_figures_reuses_cached_figures(monkeypatch):
+    import plotly.graph_objects as go
+
+    built = []
+    add_trace = go.Figure.add_trace
+    monkeypatch.setattr(
+        go.Figure, "add_trace",
+        lambda self, *args, **kwargs: built.append(1) or add_trace(self, *args, **kwargs))
+    st.cache_data.clear()
+    for _ in range(3):
+        # Fresh arrays each rerun, as _fetch_price_series hands out copies
+        timestamps = np.array([datetime(2025, 1, 1, h) for h in range(3)],
+                              dtype=object)
+        closes, volumes = np.array([0.4, 0.5, 0.6]), np.array([1.0, 0.0, 2.0])
+        fig, fig_vol = app._build_price_figures(
+            "nfl", "T", app._price_series_key(timestamps, closes, volumes),
+            timestamps, closes, volumes)
+    assert len(built) == 2  # one price and one volume trace, built once
+    assert fig_vol is not None
+
+    # A new candle changes the key, so the figures are rebuilt
+    timestamps = np.append(timestamps, datetime(2025, 1, 1, 3))
+    closes, volumes = np.append(closes, 0.7), np.append(volumes, 1.0)
+    fig, _ = app._build_price_figures(
+        "nfl", "T", app._price_series_key(timestamps, closes, volumes),
+        timestamps, closes, volumes)
+    assert len(built) == 4
+    assert list(fig.data[0].y) == [0.4, 0.5, 0.6, 0.7]
+
+    # So does a backfilled earlier candle with the same tail
+    closes = np.array([0.45, 0.5, 0.6, 0.7])
+    fig, _ = app._build_price_figures(
+        "nfl", "T", app._price_series_key(timestamps, closes, volumes),
+        timestamps, closes, volumes)
+    assert len(built) == 6
+    assert list(fig.data[0].y) == [0.45, 0.5, 0.6, 0.7]
+    st.cache_data.clear()
+
+
+def _search_event(ticker, away, home):
+    blob = f"{away} at {home} {home} {away} {away} at {home} winner?".lower()
+    return {"event_ticker": ticker, "away_team": away, "home_team": home,
+            "_search_blob": blob}
+
+
+@pytest.mark.parametrize("q, expected", [
+    ("falcons", [0, 2]),
+    ("hawks", [1, 3]),  # substring of "Seahawks", not only whole tokens
+    ("kansas winner", [1]),  # every token, in any order
+    ("winner", [0, 1, 2, 3]),
+    ("ansas", [1]),  # substring, not a whole token
+    ("(falc", []),  # regex metacharacters are literal
+    ("zzz", []),
+])
+def test_search_hits(q, expected):
+    events = [_search_event("A", "Atlanta Falcons", "Indianapolis Colts"),
+              _search_event("B", "Seattle Seahawks", "Kansas City Chiefs"),
+              _search_event("C", "Atlanta Falcons", "New Orleans Saints"),
+              _search_event("D", "Atlanta Hawks", "Boston Celtics")]
+    blobs = tuple(e["_search_blob"] for e in events)
+    assert app._search_hits(blobs, q) == expected
+
+
+def test_search_hits_sees_changed_contract_text():
+    st.cache_data.clear()
+    ev = _search_event("A", "Atlanta Falcons", "Indianapolis Colts")
+    assert app._search_hits((ev["_search_blob"],), "touchdown") == []
+    # Same ticker, but a new contract adds text to the blob
+    ev["_search_blob"] += " first touchdown scorer"
+    assert app._search_hits((ev["_search_blob"],), "touchdown") == [0]
+    st.cache_data.clear()
+
+
+def _event() -> dict:
+    close_dt = datetime.now(timezone.utc) + timedelta(days=1)
+    contracts = [
+        {"ticker": f"{EVENT_TICKER}-ATL", "event_ticker": EVENT_TICKER,
+         "title": f"{AWAY} at {HOME} Winner?", "subtitle": AWAY,
+         "yes_bid": 0.4, "yes_ask": 0.42, "open_interest": 10,
+         "volume_24h": 5, "close_dt": close_dt, "market_type": "binary"},
+        {"ticker": f"{EVENT_TICKER}-IND", "event_ticker": EVENT_TICKER,
+         "title": f"{AWAY} at {HOME} Winner?", "subtitle": HOME,
+         "yes_bid": 0.6, "yes_ask": 0.62, "open_interest": 10,
+         "volume_24h": 5, "close_dt": close_dt, "market_type": "binary"},
+    ]
+    return {
+        "event_ticker": EVENT_TICKER,
+        "pretty_event": f"{AWAY} at {HOME}",
+        "away_team": AWAY,
+        "home_team": HOME,
+        "close_dt": close_dt,
+        "open_interest_sum": 20,
+        "volume_24h_sum": 10,
+        "winner_primary": {"label": HOME, "subject_team": HOME,
+                           "yes_bid": 0.6, "yes_ask": 0.62,
+                           "no_bid": 0.38, "no_ask": 0.4,
+                           "ticker": contracts[1]["ticker"]},
+        "all_contracts": contracts,
+    }
+
+
+@pytest.fixture
+def saved_predictions(monkeypatch):
+    """Stub the network and database services; collect saved predictions."""
+    saved = []
+    monkeypatch.setattr(KalshiService, "fetch_and_group_open_games",
+                        lambda self: [_event()])
+    monkeypatch.setattr(KalshiService, "get_market_candlesticks",
+                        lambda self, **kwargs: [])
+    monkeypatch.setattr(KalshiService, "get_market_orderbook",
+                        lambda self, ticker: None)
+    monkeypatch.setattr(OddsAPIService, "get_odds", lambda self: [])
+    monkeypatch.setattr(ESPNService, "get_team_leaders",
+                        lambda self, team_name, category="passing": [])
+    monkeypatch.setattr(espn_lookup, "find_game_id",
+                        lambda away, home, close_dt: None)
+    monkeypatch.setattr(GeminiService, "generate_game_summary",
+                        lambda self, **kwargs: "Preview.")
+
+    monkeypatch.setattr(PredictionService, "__init__", lambda self: None)
+    monkeypatch.setattr(PredictionService, "get_user_prediction",
+                        lambda self, session_id, event_ticker: None)
+    monkeypatch.setattr(PredictionService, "get_community_consensus",
+                        lambda self, event_ticker: None)
+    monkeypatch.setattr(PredictionService, "save_prediction",
+                        lambda self, **kwargs: saved.append(kwargs))
+    monkeypatch.setattr(PredictionService, "get_espn_event_id",
+                        lambda self, event_ticker: None)
+    monkeypatch.setattr(PredictionService, "save_espn_event_id",
+                        lambda self, *args, **kwargs: None)
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    yield saved
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def test_save_prediction_form(saved_predictions):
+    at = AppTest.from_file(APP_PATH, default_timeout=30)
+    at.query_params["page"] = "detail"
+    at.query_params["sport"] = "nfl"
+    at.query_params["event"] = EVENT_TICKER
+    at.run()
+    assert not at.exception
+
+    submit = next(b for b in at.button if "Save My Prediction" in b.label)
+    submit.click().run()
+
+    assert not at.exception
+    assert not at.error, [e.value for e in at.error]
+    assert len(saved_predictions) == 1
+    saved = saved_predictions[0]
+    assert saved["event_ticker"] == EVENT_TICKER
+    assert saved["predicted_winner"] == AWAY
+    assert saved["kalshi_prob"] == pytest.approx(0.6)
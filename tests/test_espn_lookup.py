@@ -0,0 +1,77 @@
+"""
+Tests for the ESPN game-id lookup in espn_lookup.py.
+"""
+
+import datetime as dt
+from types import SimpleNamespace
+
+import pytest
+
+import espn_lookup
+
+
+def _scoreboard(event_id, away, home):
+    return {"events": [{"id": event_id, "competitions": [{"competitors": [
+        {"homeAway": "home", "team": {"displayName": home}},
+        {"homeAway": "away", "team": {"displayName": away}},
+    ]}]}]}
+
+
+@pytest.fixture
+def espn_gets(monkeypatch):
+    """Serve scoreboards from a {date: scoreboard} dict; record each fetch."""
+    boards, fetched = {}, []
+
+    class Response:
+        def __init__(self, date):
+            self.date = date
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return boards.get(self.date, {"events": []})
+
+    def get(url, params, timeout):
+        fetched.append(params["dates"])
+        return Response(params["dates"])
+
+    monkeypatch.setattr(espn_lookup._SESSION, "get", get)
+    espn_lookup._fetch_scoreboard_cached.cache_clear()
+    yield boards, fetched
+    espn_lookup._fetch_scoreboard_cached.cache_clear()
+
+
+def test_find_game_id_matches_normalized_names(espn_gets):
+    boards, _ = espn_gets
+    boards["20251110"] = _scoreboard("401", "Atlanta Falcons",
+                                     "Indianapolis Colts")
+    close_dt = dt.datetime(2025, 11, 9, 18, tzinfo=dt.timezone.utc)
+    assert espn_lookup.find_game_id("atlanta falcons", "Indianapolis  Colts.",
+                                    close_dt) == "401"
+    assert espn_lookup.find_game_id("Indianapolis Colts", "Atlanta Falcons",
+                                    close_dt) is None
+
+
+def test_scoreboards_are_cached_within_the_ttl(espn_gets):
+    _, fetched = espn_gets
+    espn_lookup._fetch_scoreboard("20251109")
+    espn_lookup._fetch_scoreboard("20251109")
+    assert fetched == ["20251109"]
+
+
+def test_scoreboards_are_refetched_after_the_ttl(espn_gets, monkeypatch):
+    boards, fetched = espn_gets
+    clock = [1000.0]
+    monkeypatch.setattr(espn_lookup, "time",
+                        SimpleNamespace(monotonic=lambda: clock[0]))
+
+    assert espn_lookup._fetch_scoreboard("20251109") == {"events": []}
+    # The opponent is only posted later
+    boards["20251109"] = _scoreboard("401", "Atlanta Falcons",
+                                     "Indianapolis Colts")
+    assert espn_lookup._fetch_scoreboard("20251109") == {"events": []}
+
+    clock[0] += espn_lookup._SCOREBOARD_TTL
+    assert espn_lookup._fetch_scoreboard("20251109")["events"][0]["id"] == "401"
+    assert fetched == ["20251109", "20251109"]
@@ -0,0 +1,172 @@
+"""
+Tests for the ESPN response cache and team-name matching in espn_service.py.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import espn_service
+from espn_service import ESPNService
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Frozen monotonic clock for the response cache; advance it by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(espn_service, "time",
+                        SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(ESPNService, "_response_cache", {})
+    return now
+
+
+def test_live_entries_expire_after_live_ttl(clock):
+    service = ESPNService("nfl")
+    service._cache_put(("scoreboard", "20251109"), {"events": []}, final=False)
+
+    clock[0] += ESPNService._live_ttl - 1
+    assert service._cache_get(("scoreboard", "20251109")) == {"events": []}
+
+    clock[0] += 1
+    assert service._cache_get(("scoreboard", "20251109")) is None
+    # The expired entry is dropped on read, not kept around
+    assert ESPNService._response_cache == {}
+
+
+def test_final_entries_outlive_the_live_ttl(clock):
+    service = ESPNService("nfl")
+    service._cache_put(("summary", "401"), {"header": {}}, final=True)
+
+    clock[0] += ESPNService._live_ttl * 10
+    assert service._cache_get(("summary", "401")) == {"header": {}}
+
+    clock[0] += ESPNService._final_ttl
+    assert service._cache_get(("summary", "401")) is None
+
+
+def test_cache_is_shared_across_instances(clock):
+    ESPNService("nfl")._cache_put(("summary", "401"), {"id": "401"}, final=True)
+    assert ESPNService("nba")._cache_get(("summary", "401")) == {"id": "401"}
+
+
+def test_full_cache_drops_expired_entries_first(clock, monkeypatch):
+    monkeypatch.setattr(ESPNService, "_cache_max", 3)
+    service = ESPNService("nfl")
+    service._cache_put(("a",), {}, final=True)
+    service._cache_put(("live",), {}, final=False)
+    service._cache_put(("b",), {}, final=True)
+
+    clock[0] += ESPNService._live_ttl
+    service._cache_put(("c",), {}, final=True)
+
+    assert list(ESPNService._response_cache) == [("a",), ("b",), ("c",)]
+
+
+def test_full_cache_evicts_the_oldest_entry(clock, monkeypatch):
+    monkeypatch.setattr(ESPNService, "_cache_max", 3)
+    service = ESPNService("nfl")
+    for key in ("a", "b", "c"):
+        service._cache_put((key,), {}, final=True)
+
+    # Re-putting a key moves it to the back, so "b" is now the oldest
+    service._cache_put(("a",), {"v": 2}, final=True)
+    service._cache_put(("d",), {}, final=True)
+
+    assert list(ESPNService._response_cache) == [("c",), ("a",), ("d",)]
+    assert service._cache_get(("a",)) == {"v": 2}
+
+
+@pytest.mark.parametrize("s1, s2, distance", [
+    ("", "", 0),
+    ("", "chiefs", 6),
+    ("falcons", "falcons", 0),
+    ("falcons", "falcon", 1),
+    ("chiefs", "cheifs", 1),
+    ("dortmund", "dortmunt", 1),
+    ("kitten", "sitting", 3),
+])
+def test_sift4(s1, s2, distance):
+    assert espn_service._sift4(s1, s2) == distance
+    assert espn_service._sift4(s2, s1) == distance
+
+
+@pytest.mark.parametrize("espn_name, kalshi_name, expected", [
+    ("Kansas City Chiefs", "KC", True),
+    ("Kansas City Chiefs", "Kansas City", True),
+    ("Los Angeles Rams", "LA Rams", True),
+    # An alias miss still falls through to the loose matcher
+    ("Los Angeles Chargers", "Los Angeles", True),
+    ("Los Angeles Chargers", "L.A. Chargers", True),
+    ("New York Jets", "New York Giants", False),
+])
+def test_team_names_match_known_teams(espn_name, kalshi_name,
+                                                       expected):
+    assert ESPNService("nfl")._team_names_match(espn_name, kalshi_name) is expected
+
+
+@pytest.mark.parametrize("espn_name, kalshi_name, expected", [
+    ("Borussia Dortmund", "Borusia Dortmund", True),
+    ("Wrexham AFC", "Wrexam AFC", True),
+    ("Inter Miami", "Inter Milan", False),
+    ("Sporting KC", "Sporting CP", False),
+    ("Jets", "Nets", False),
+])
+def test_team_names_match_tolerates_one_typo_for_unknown_teams(espn_name,
+                                                                kalshi_name,
+                                                                expected):
+    assert ESPNService("nfl")._team_names_match(espn_name, kalshi_name) is expected
+
+
+def _event(completed=True, home_winner=True, home_score="27"):
+    return {
+        "id": "401",
+        "name": "Atlanta Falcons at Indianapolis Colts",
+        "shortName": "ATL @ IND",
+        "date": "2025-11-09T14:30Z",
+        "competitions": [{"competitors": [
+            {"id": "11", "homeAway": "home", "score": home_score,
+             "winner": home_winner,
+             "team": {"displayName": "Indianapolis Colts", "abbreviation": "IND"}},
+            {"id": "1", "homeAway": "away", "score": "24",
+             "winner": not home_winner,
+             "team": {"displayName": "Atlanta Falcons", "abbreviation": "ATL"}},
+        ]}],
+        "status": {"type": {"completed": completed, "state": "post",
+                            "description": "Final"}},
+    }
+
+
+def test_extract_game_result_final_game():
+    result = ESPNService("nfl")._extract_game_result(_event())
+
+    assert result["game_id"] == "401"
+    assert result["short_name"] == "ATL @ IND"
+    assert result["status"] == {"completed": True, "description": "Final",
+                                "state": "post"}
+    assert result["home_team"] == {"id": "11", "name": "Indianapolis Colts",
+                                   "abbreviation": "IND", "score": 27,
+                                   "winner": True}
+    assert result["away_team"]["score"] == 24
+    assert result["winner"] == "home"
+
+
+def test_extract_game_result_away_winner():
+    result = ESPNService("nfl")._extract_game_result(_event(home_winner=False))
+    assert result["winner"] == "away"
+
+
+def test_extract_game_result_unfinished_game_has_no_winner():
+    result = ESPNService("nfl")._extract_game_result(
+        _event(completed=False, home_score=""))
+    assert result["winner"] is None
+    assert result["home_team"]["score"] is None
+
+
+def test_extract_game_result_tolerates_missing_fields():
+    result = ESPNService("nfl")._extract_game_result(
+        {"id": "401", "competitions": [{"competitors": None}], "status": None})
+
+    assert result["home_team"] is None and result["away_team"] is None
+    assert result["status"] == {"completed": False, "description": "",
+                                "state": ""}
+    assert result["winner"] is None
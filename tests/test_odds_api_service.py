@@ -0,0 +1,68 @@
+"""
+Tests for the bookmaker odds lookups in odds_api_service.py.
+"""
+
+import pytest
+
+from odds_api_service import OddsAPIService
+
+AWAY, HOME = "Atlanta Falcons", "Indianapolis Colts"
+
+
+def _bookmaker(title, away_price, home_price, key="h2h"):
+    return {"title": title, "markets": [{"key": key, "outcomes": [
+        {"name": AWAY, "price": away_price},
+        {"name": HOME, "price": home_price},
+    ]}]}
+
+
+GAME = {
+    "away_team": AWAY,
+    "home_team": HOME,
+    "bookmakers": [
+        _bookmaker("DraftKings", 150, -170),
+        _bookmaker("FanDuel", 160, -180),
+        _bookmaker("BetMGM", 140, -160),
+        _bookmaker("Spreads Only", 300, -400, key="spreads"),
+    ],
+}
+
+
+@pytest.fixture
+def odds_api():
+    return OddsAPIService("nfl")
+
+
+def test_index_by_team_groups_h2h_odds(odds_api):
+    index = odds_api.index_by_team(GAME)
+    assert set(index) == {AWAY, HOME}
+    assert [e["bookmaker"] for e in index[AWAY]] == [
+        "DraftKings", "FanDuel", "BetMGM"]
+    assert index[HOME][0] == {"bookmaker": "DraftKings", "odds": -170,
+                              "probability": pytest.approx(62.96, abs=0.01)}
+
+
+def test_index_by_team_without_bookmakers(odds_api):
+    assert odds_api.index_by_team({}) == {}
+    assert odds_api.index_by_team(None) == {}
+
+
+def test_get_best_odds_picks_the_best_price(odds_api):
+    assert odds_api.get_best_odds(GAME, AWAY)["bookmaker"] == "FanDuel"
+    assert odds_api.get_best_odds(GAME, HOME)["odds"] == -160
+    assert odds_api.get_best_odds(GAME, "Denver Broncos") is None
+
+
+def test_lookups_accept_the_game_or_its_index(odds_api):
+    index = odds_api.index_by_team(GAME)
+    for team in (AWAY, HOME):
+        assert odds_api.get_best_odds(index, team) == \
+            odds_api.get_best_odds(GAME, team)
+        assert odds_api.get_all_bookmaker_odds(index, team) == \
+            odds_api.get_all_bookmaker_odds(GAME, team)
+
+
+def test_get_best_odds_returns_a_copy(odds_api):
+    index = odds_api.index_by_team(GAME)
+    odds_api.get_best_odds(index, AWAY)["odds"] = 0
+    assert odds_api.get_best_odds(index, AWAY)["odds"] == 160